@@ -0,0 +1,69 @@
+import pygame
+from collections import defaultdict
+from settings import CHUNK_SIZE, TILE_SIZE
+
+
+class AnimationClock:
+    """
+    Loops over a frame set at a fixed rate.
+
+    Everything showing the same animation reads the current frame from one
+    clock, so it is advanced once per tick however many tiles use it.
+    """
+
+    def __init__(self, frames, speed):
+        self.frames = frames
+        self.speed = speed
+        self.frame_index = 0
+        self.frame = frames[0]
+
+    def update(self, delta_time):
+        """Advance the animation by delta_time seconds."""
+        self.frame_index += self.speed * delta_time
+        if self.frame_index >= len(self.frames):
+            self.frame_index = 0
+        self.frame = self.frames[int(self.frame_index)]
+
+
+class AnimatedTiles:
+    """
+    Tile positions drawn with the current frame of an animation clock.
+
+    Tiles are not sprites: they are bucketed by chunk and only the ones
+    inside the view are turned into blits, as a camera layer source.
+    """
+
+    def __init__(self, clock, chunk_size=CHUNK_SIZE * TILE_SIZE):
+        self.clock = clock
+        self.chunk_size = chunk_size
+        self.tile_rect = clock.frame.get_rect()
+        self.chunk_tiles = defaultdict(list)
+
+    def add(self, position):
+        """Add a tile with its top left corner at position."""
+        chunk = (position[0] // self.chunk_size, position[1] // self.chunk_size)
+        self.chunk_tiles[chunk].append(position)
+
+    def visible_blits(self, view_rect, offset_x, offset_y):
+        """Return (frame, position) pairs for the tiles inside view_rect."""
+        frame = self.clock.frame
+        width, height = self.tile_rect.size
+        left, top = view_rect.left - width, view_rect.top - height
+        right, bottom = view_rect.right, view_rect.bottom
+        # Tiles are anchored by their top left corner, so a tile can reach
+        # into the view from the chunks above and to the left of it.
+        search_rect = pygame.Rect(left, top, right - left, bottom - top)
+
+        blits = []
+        for chunk_y in range(
+            search_rect.top // self.chunk_size,
+            (search_rect.bottom - 1) // self.chunk_size + 1,
+        ):
+            for chunk_x in range(
+                search_rect.left // self.chunk_size,
+                (search_rect.right - 1) // self.chunk_size + 1,
+            ):
+                for x, y in self.chunk_tiles.get((chunk_x, chunk_y), ()):
+                    if left < x < right and top < y < bottom:
+                        blits.append((frame, (x - offset_x, y - offset_y)))
+        return blits
@@ -0,0 +1,127 @@
+"""
+Asset pack builder.
+
+Decodes every PNG under graphics/ once and stores the raw RGBA pixels in a
+single pack file, so the game can build its surfaces without decoding PNGs:
+
+    python src/asset_pack.py --output data/assets.pack
+"""
+
+import argparse
+import json
+import mmap
+import os
+import pygame
+import struct
+import sys
+from pathlib import Path
+from settings import ASSET_PACK_PATH, current_dir
+
+PACK_MAGIC = b"SPAK"
+PACK_VERSION = 1
+
+# magic, version, index length
+PACK_HEADER = struct.Struct("<4sHI")
+
+
+class AssetPack:
+    """
+    Raw RGBA images mapped from a pack file.
+
+    The index holds, for each image path relative to the root, its offset
+    in the pixel data, its size and the modification time and byte size of
+    the PNG it was built from. An entry is only used while its PNG is
+    unchanged.
+    """
+
+    def __init__(self, root, index, pixels):
+        self.root = Path(root)
+        self.entries = {
+            str((self.root / path).resolve()): entry for path, entry in index.items()
+        }
+        self.pixels = pixels
+
+    def is_fresh(self, key):
+        """Return whether the pack holds an up-to-date image for a resolved path."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (entry[3], entry[4])
+
+    def surface(self, key):
+        """Return an unconverted surface viewing the pixels of a resolved path."""
+        offset, width, height = self.entries[key][:3]
+        return pygame.image.frombuffer(
+            self.pixels[offset : offset + width * height * 4], (width, height), "RGBA"
+        )
+
+
+def read_pack(path, root=current_dir.parent):
+    """Map the pack at path, or return None if there is no usable pack."""
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, index_length = PACK_HEADER.unpack_from(mapped)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            return None
+        index_end = PACK_HEADER.size + index_length
+        index = json.loads(mapped[PACK_HEADER.size : index_end])
+    except (struct.error, ValueError):
+        return None
+    return AssetPack(root, index, memoryview(mapped)[index_end:])
+
+
+def build_pack(path, root=current_dir.parent, folder="graphics"):
+    """Decode every PNG under root/folder and write them as a pack."""
+    index = {}
+    pixels = []
+    offset = 0
+    for file in sorted((Path(root) / folder).rglob("*.png")):
+        stat = file.stat()
+        image = pygame.image.load(file)
+        width, height = image.get_size()
+        # Converting first turns palettes and colorkeys into plain alpha
+        data = pygame.image.tobytes(image.convert_alpha(), "RGBA")
+        index[file.relative_to(root).as_posix()] = (
+            offset,
+            width,
+            height,
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+        pixels.append(data)
+        offset += len(data)
+
+    encoded_index = json.dumps(index).encode()
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(encoded_index)))
+        file.write(encoded_index)
+        file.writelines(pixels)
+    os.replace(temporary_path, path)
+    return len(index), offset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default=ASSET_PACK_PATH)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    images, pixel_bytes = build_pack(args.output)
+    pygame.quit()
+    print(f"Packed {images} images ({pixel_bytes / 2**20:.1f} MiB) into {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
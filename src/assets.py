@@ -0,0 +1,207 @@
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakKeyDictionary
+from pathlib import Path
+from settings import ASSET_FRAME_SET_LIMIT
+from asset_pack import read_pack
+
+
+def frame_sort_key(path):
+    """Sort numbered frames numerically and everything else by name."""
+    return (0, int(path.stem), "") if path.stem.isdigit() else (1, 0, path.stem)
+
+
+class AssetCache:
+    """
+    Memoizes converted surfaces, frame sets and sounds by resolved path.
+
+    Frame sets can be bounded with max_frame_sets; the least recently used
+    set is dropped once the bound is exceeded and reloaded on its next use.
+
+    Images come from an asset pack when one is loaded and up to date, and
+    otherwise from their PNG, possibly decoded ahead of time by preload().
+    """
+
+    def __init__(self, max_frame_sets=None):
+        self.max_frame_sets = max_frame_sets
+        self.pack = None
+        self.decoded = {}
+        self.loaded_paths = set()
+        self.images = {}
+        self.frame_sets = OrderedDict()
+        self.sounds = {}
+        self.silhouettes = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.silhouette_hits = 0
+        self.silhouette_misses = 0
+
+    def image(self, path):
+        """Return the converted surface for an image file."""
+        key = self._key(path)
+        if key in self.images:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.images[key] = self._load_image(path)
+        return self.images[key]
+
+    def frames(self, path):
+        """Return the frames of a folder as a list ordered by file name."""
+        return self._frame_set("list", path)
+
+    def frame_dict(self, path):
+        """Return the frames of a folder as a dict keyed by file stem."""
+        return self._frame_set("dict", path)
+
+    def sound(self, path):
+        """Return the decoded sound for an audio file."""
+        key = self._key(path)
+        if key in self.sounds:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.sounds[key] = pygame.mixer.Sound(key)
+        return self.sounds[key]
+
+    def load_pack(self, path):
+        """Serve images from the asset pack at path, if it is usable."""
+        self.pack = read_pack(path)
+        return self.pack is not None
+
+    def preload(self, folders, workers=4):
+        """
+        Decode the PNGs of folders on a thread pool, ahead of their first use.
+
+        Images the pack holds up to date, or that were loaded already, are
+        skipped.
+        """
+        paths = [
+            path
+            for folder in folders
+            for path in sorted(Path(folder).rglob("*.png"))
+            if self._needs_decoding(self._key(path))
+        ]
+        with ThreadPoolExecutor(workers) as executor:
+            for path, surf in zip(paths, executor.map(pygame.image.load, paths)):
+                self.decoded[self._key(path)] = surf
+
+    def drop_preloaded(self):
+        """Free the preloaded images nothing has asked for, returning how many."""
+        unused = len(self.decoded)
+        self.decoded.clear()
+        return unused
+
+    def silhouette(self, surf):
+        """
+        Return a white, colorkeyed silhouette of a surface.
+
+        Silhouettes are cached by the identity of their source surface and
+        dropped along with it. They are counted apart from the file-backed
+        assets, so they do not skew the hit rate of those.
+        """
+        if surf in self.silhouettes:
+            self.silhouette_hits += 1
+        else:
+            self.silhouette_misses += 1
+            silhouette = pygame.mask.from_surface(surf).to_surface()
+            silhouette.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            self.silhouettes[surf] = silhouette.convert()
+        return self.silhouettes[surf]
+
+    def stats(self):
+        """Return hit/miss counts, entry counts and memory footprint in bytes."""
+        image_bytes = sum(map(surface_bytes, self.images.values()))
+        frame_bytes = sum(
+            surface_bytes(surf)
+            for frames in self.frame_sets.values()
+            for surf in (frames.values() if isinstance(frames, dict) else frames)
+        )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self.images),
+            "frame_sets": len(self.frame_sets),
+            "sounds": len(self.sounds),
+            "silhouettes": len(self.silhouettes),
+            "silhouette_hits": self.silhouette_hits,
+            "silhouette_misses": self.silhouette_misses,
+            "image_bytes": image_bytes + frame_bytes,
+            "sound_bytes": sum(map(sound_bytes, self.sounds.values())),
+        }
+
+    def clear(self):
+        """Drop every cached asset and reset the counters."""
+        self.decoded.clear()
+        self.loaded_paths.clear()
+        self.images.clear()
+        self.frame_sets.clear()
+        self.sounds.clear()
+        self.silhouettes.clear()
+        self.hits = 0
+        self.misses = 0
+        self.silhouette_hits = 0
+        self.silhouette_misses = 0
+
+    def _frame_set(self, kind, path):
+        """Return a cached frame set, loading it and enforcing the LRU bound."""
+        key = (kind, self._key(path))
+        if key in self.frame_sets:
+            self.hits += 1
+            self.frame_sets.move_to_end(key)
+            return self.frame_sets[key]
+
+        self.misses += 1
+        files = sorted(
+            (file for file in Path(path).glob("*") if file.is_file()),
+            key=frame_sort_key,
+        )
+        if kind == "list":
+            frames = [self._load_image(file) for file in files]
+        else:
+            frames = {file.stem: self._load_image(file) for file in files}
+        self.frame_sets[key] = frames
+
+        if self.max_frame_sets is not None:
+            while len(self.frame_sets) > self.max_frame_sets:
+                self.frame_sets.popitem(last=False)
+        return frames
+
+    def _load_image(self, path):
+        """Load a single image and convert it to alpha."""
+        key = self._key(path)
+        self.loaded_paths.add(key)
+        if key in self.decoded:
+            surf = self.decoded.pop(key)
+        elif self.pack and self.pack.is_fresh(key):
+            surf = self.pack.surface(key)
+        else:
+            surf = pygame.image.load(path)
+        return surf.convert_alpha()
+
+    def _needs_decoding(self, key):
+        """Return whether an image is neither loaded, decoded nor packed."""
+        return (
+            key not in self.loaded_paths
+            and key not in self.decoded
+            and not (self.pack and self.pack.is_fresh(key))
+        )
+
+    def _key(self, path):
+        """Normalize a path so relative and absolute spellings share entries."""
+        return str(Path(path).resolve())
+
+
+def surface_bytes(surf):
+    """Return the size of a surface's pixel buffer."""
+    return surf.get_pitch() * surf.get_height()
+
+
+def sound_bytes(sound):
+    """Return the decoded size of a sound in the current mixer format."""
+    frequency, size, channels = pygame.mixer.get_init() or (0, 0, 0)
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+
+assets = AssetCache(ASSET_FRAME_SET_LIMIT)
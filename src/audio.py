@@ -0,0 +1,131 @@
+import pygame
+import threading
+from collections import deque
+from assets import assets
+from settings import AUDIO_CHANNELS, SOUND_EFFECTS
+
+
+class AudioManager:
+    """
+    Plays named sound effects on channel pools reserved per category.
+
+    Each effect is decoded once, optionally on a background thread, and
+    may play on at most its voice limit of channels at a time; a new play
+    past the limit restarts its oldest voice. When every channel of a
+    category is busy, the one started longest ago is taken over. Music is
+    streamed from disk by pygame.mixer.music rather than decoded.
+    """
+
+    def __init__(self, effects, channels):
+        self.effects = effects
+        self.channel_counts = channels
+        self.pools = {}
+        self.sounds = {}
+        self.voices = {name: [] for name in effects}
+        self.loader = None
+        self.load_error = None
+
+    def load(self, in_background=False):
+        """
+        Reserve the channel pools and decode every effect.
+
+        Loading again, as each new Level does, starts over with fresh pools
+        and no voices.
+        """
+        if self.loader:
+            self.loader.join()
+            self.loader = None
+        self.pools = {}
+        self.voices = {name: [] for name in self.effects}
+        self.load_error = None
+        if not pygame.mixer.get_init():
+            return
+
+        reserved = sum(self.channel_counts.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+        pygame.mixer.set_reserved(reserved)
+        first_channel = 0
+        for category, count in self.channel_counts.items():
+            self.pools[category] = deque(
+                pygame.mixer.Channel(index)
+                for index in range(first_channel, first_channel + count)
+            )
+            first_channel += count
+
+        if in_background:
+            self.loader = threading.Thread(
+                target=self._decode_in_background, daemon=True
+            )
+            self.loader.start()
+        else:
+            self._decode_all()
+
+    def wait(self):
+        """
+        Block until the effects decoding in the background are ready.
+
+        Raises the error that stopped the background decoding, if any.
+        """
+        if self.loader:
+            self.loader.join()
+            self.loader = None
+        if self.load_error:
+            raise self.load_error
+
+    def play(self, name):
+        """Play a sound effect, unless audio is unavailable."""
+        if not self.pools:
+            return
+        self.wait()
+
+        sound = self.sounds[name]
+        category, _, voice_limit = self.effects[name][1:]
+        # Voices that finished or were taken over by another sound are dropped
+        voices = [
+            channel
+            for channel in dict.fromkeys(self.voices[name])
+            if channel.get_sound() is sound
+        ]
+        pool = self.pools[category]
+        if len(voices) >= voice_limit:
+            channel = voices.pop(0)
+        else:
+            channel = self._free_channel(pool)
+        # Pools are kept in the order their channels last started playing
+        pool.remove(channel)
+        pool.append(channel)
+        channel.play(sound)
+        voices.append(channel)
+        self.voices[name] = voices
+
+    def play_music(self, path, volume, loops=-1):
+        """Stream a music file in a loop, unless audio is unavailable."""
+        if not pygame.mixer.get_init():
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def _free_channel(self, pool):
+        """Return an idle channel of a pool, or the one started longest ago."""
+        for channel in pool:
+            if not channel.get_busy():
+                return channel
+        return pool[0]
+
+    def _decode_in_background(self):
+        """Decode every effect, keeping any error for wait() to raise."""
+        try:
+            self._decode_all()
+        except Exception as error:
+            self.load_error = error
+
+    def _decode_all(self):
+        """Decode every effect and apply its volume."""
+        for name, (path, _, volume, _) in self.effects.items():
+            sound = assets.sound(path)
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+
+
+audio = AudioManager(SOUND_EFFECTS, AUDIO_CHANNELS)
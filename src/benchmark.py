@@ -0,0 +1,228 @@
+"""
+Headless frame benchmark.
+
+Builds a Level under the SDL dummy drivers, drives the player from a
+scripted input timeline and reports frame time percentiles as JSON:
+
+    python src/benchmark.py --scenario walk --frames 600 --output bench.json
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import pygame
+from time import perf_counter
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_RATE, LAYERS, TILE_SIZE
+from dirty import present
+from level import Level
+from soil import FARMABLE
+from profiler import profiler
+
+
+class KeyState:
+    """Key state sequence in the shape returned by pygame.key.get_pressed."""
+
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class ScriptedInput:
+    """Replays a timeline of (frame count, pressed keys) steps in a loop."""
+
+    def __init__(self, timeline):
+        self.timeline = timeline or [(1, ())]
+        self.step = 0
+        self.frames_left = self.timeline[0][0]
+
+    def __call__(self):
+        return KeyState(set(self.timeline[self.step][1]))
+
+    def advance(self):
+        """Move the timeline forward by one frame."""
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.step = (self.step + 1) % len(self.timeline)
+            self.frames_left = self.timeline[self.step][0]
+
+
+WALK_TIMELINE = [
+    (90, (pygame.K_d,)),
+    (60, (pygame.K_s,)),
+    (90, (pygame.K_a,)),
+    (60, (pygame.K_w,)),
+    (45, (pygame.K_d, pygame.K_s)),
+    (45, (pygame.K_a, pygame.K_w)),
+]
+
+
+def setup_idle(level):
+    level.is_raining = False
+    return []
+
+
+def setup_walk(level):
+    level.is_raining = False
+    return WALK_TIMELINE
+
+
+def setup_rain(level):
+    level.is_raining = True
+    level.soil_layer.is_raining = True
+    return WALK_TIMELINE
+
+
+def setup_farm(level):
+    """Till, plant and water every farmable tile, then grow the crops."""
+    level.is_raining = False
+    soil_layer = level.soil_layer
+    seeds = level.player.seeds
+    rows, columns = (soil_layer.grid & FARMABLE).nonzero()
+    for index, (y, x) in enumerate(zip(rows.tolist(), columns.tolist())):
+        center = ((x + 0.5) * TILE_SIZE, (y + 0.5) * TILE_SIZE)
+        soil_layer.get_hit(center)
+        soil_layer.plant_seed(center, seeds[index % len(seeds)])
+    soil_layer.water_all()
+    soil_layer.update_plants()
+    return WALK_TIMELINE
+
+
+def setup_shop(level):
+    level.is_raining = False
+    level.toggle_shop()
+    return []
+
+
+def setup_sleep(level):
+    """Stand on the bed and keep pressing Enter, sleeping again after each night."""
+    level.is_raining = False
+    player = level.player
+    bed = next(
+        sprite for sprite in level.sprite_groups["interactions"] if sprite.name == "Bed"
+    )
+    player.hitbox.center = bed.rect.center
+    player._update_position()
+    return [(1, (pygame.K_RETURN,))]
+
+
+SCENARIOS = {
+    "idle": setup_idle,
+    "walk": setup_walk,
+    "rain": setup_rain,
+    "farm": setup_farm,
+    "shop": setup_shop,
+    "sleep": setup_sleep,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def sprite_counts(level):
+    """Return the number of sprites in the camera group, total and per layer."""
+    camera = level.sprite_groups["all"]
+    layer_names = {layer: name for name, layer in LAYERS.items()}
+    return {
+        "total": len(camera),
+        "by_layer": {
+            layer_names.get(layer, str(layer)): len(bucket)
+            for layer, bucket in sorted(camera.layers.items())
+        },
+    }
+
+
+def run_scenario(name, frames, warmup, seed):
+    """Run one scenario and return its measurements."""
+    random.seed(seed)
+    level = Level(save_path=None)
+    script = ScriptedInput(SCENARIOS[name](level))
+    level.player.input_source = script
+    tick_length = 1 / SIMULATION_RATE
+
+    frame_times = []
+    for frame in range(warmup + frames):
+        profiler.begin_frame()
+        start = perf_counter()
+        pygame.event.pump()
+        level.update(tick_length)
+        present(level.draw())
+        if frame >= warmup:
+            frame_times.append(perf_counter() - start)
+        script.advance()
+
+    total_time = sum(frame_times)
+    frame_ms = sorted(frame_time * 1000 for frame_time in frame_times)
+    return {
+        "frames": frames,
+        "frame_ms": {
+            "mean": total_time * 1000 / frames,
+            "p50": percentile(frame_ms, 0.50),
+            "p95": percentile(frame_ms, 0.95),
+            "p99": percentile(frame_ms, 0.99),
+            "max": frame_ms[-1],
+        },
+        "fps": frames / total_time,
+        "sprites": sprite_counts(level),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="scenario to run, may be repeated (default: all)",
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument(
+        "--trace", help="write a Chrome trace of the last frames to this file"
+    )
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if args.trace:
+        profiler.toggle()
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "frames": args.frames,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "scenarios": {
+            name: run_scenario(name, args.frames, args.warmup, args.seed)
+            for name in args.scenario or SCENARIOS
+        },
+    }
+    if args.trace:
+        profiler.begin_frame()
+        profiler.write_trace(args.trace)
+    pygame.quit()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
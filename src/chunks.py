@@ -0,0 +1,93 @@
+import pygame
+from collections import defaultdict
+from settings import CHUNK_SIZE, TILE_SIZE
+
+
+class StaticChunks:
+    """
+    Rasterizes tiles that never change into fixed-size chunk surfaces.
+
+    Chunks are keyed by (chunk_x, chunk_y, z). Tiles are baked in the same
+    order the camera would draw them as sprites, so the result matches.
+    Each chunk keeps the list of its tiles, so its surface can be dropped
+    and baked again later.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE * TILE_SIZE):
+        self.chunk_size = chunk_size
+        self.tiles = defaultdict(list)
+        self.chunks = {}
+        self.z_layers = set()
+
+    def add(self, position, surf, z):
+        """Queue a static surface for baking into the chunks of layer z."""
+        rect = surf.get_rect(topleft=position)
+        for chunk_x, chunk_y in self._chunks_touching(rect):
+            self.tiles[(chunk_x, chunk_y, z)].append((rect, surf))
+        self.z_layers.add(z)
+
+    def layers(self):
+        """Return the z-layers that hold tiles."""
+        return set(self.z_layers)
+
+    def bake(self):
+        """Bake every chunk that holds tiles."""
+        for key in self.tiles:
+            self._bake(key)
+
+    def bake_chunk(self, chunk_x, chunk_y):
+        """Bake the surfaces of a chunk on every layer."""
+        for z in self.z_layers:
+            if (chunk_x, chunk_y, z) in self.tiles:
+                self._bake((chunk_x, chunk_y, z))
+
+    def drop_chunk(self, chunk_x, chunk_y):
+        """Free the surfaces of a chunk; its tiles are kept for rebaking."""
+        for z in self.z_layers:
+            self.chunks.pop((chunk_x, chunk_y, z), None)
+
+    def _bake(self, key):
+        """Blit the tiles of a chunk key into its surface, unless baked."""
+        if key in self.chunks:
+            return
+        chunk_x, chunk_y, _ = key
+        chunk = pygame.Surface(
+            (self.chunk_size, self.chunk_size), pygame.SRCALPHA
+        ).convert_alpha()
+        # Stable sort keeps insertion order between equal centers.
+        for rect, surf in sorted(self.tiles[key], key=lambda tile: tile[0].centery):
+            chunk.blit(
+                surf,
+                (
+                    rect.x - chunk_x * self.chunk_size,
+                    rect.y - chunk_y * self.chunk_size,
+                ),
+            )
+        self.chunks[key] = chunk
+
+    def visible_blits(self, z, view_rect, offset_x, offset_y):
+        """Return (surface, position) pairs for the chunks inside view_rect."""
+        blits = []
+        for chunk_x, chunk_y in self._chunks_touching(view_rect):
+            chunk = self.chunks.get((chunk_x, chunk_y, z))
+            if chunk is not None:
+                blits.append(
+                    (
+                        chunk,
+                        (
+                            chunk_x * self.chunk_size - offset_x,
+                            chunk_y * self.chunk_size - offset_y,
+                        ),
+                    )
+                )
+        return blits
+
+    def _chunks_touching(self, rect):
+        """Yield the chunk coordinates overlapped by rect."""
+        for chunk_y in range(
+            rect.top // self.chunk_size, (rect.bottom - 1) // self.chunk_size + 1
+        ):
+            for chunk_x in range(
+                rect.left // self.chunk_size, (rect.right - 1) // self.chunk_size + 1
+            ):
+                yield chunk_x, chunk_y
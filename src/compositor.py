@@ -0,0 +1,48 @@
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+WHITE = (255, 255, 255)
+
+
+class TintCompositor:
+    """
+    Applies every full-screen color modulation in a single multiply pass.
+
+    Tint sources are callables returning an (r, g, b) color. Their product
+    is filled into the tint surface only when it changes, and the pass is
+    skipped entirely while the product is white.
+    """
+
+    def __init__(self):
+        self.display_surface = pygame.display.get_surface()
+        self.tint_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.tint_surface.fill(WHITE)
+        self.surface_tint = WHITE
+        self.sources = []
+
+    def add_tint(self, source):
+        """Register a callable returning a color to multiply the screen by."""
+        self.sources.append(source)
+
+    def combined_tint(self):
+        """Return the product of all source colors."""
+        red, green, blue = WHITE
+        for source in self.sources:
+            source_red, source_green, source_blue = source()
+            red = red * int(source_red) // 255
+            green = green * int(source_green) // 255
+            blue = blue * int(source_blue) // 255
+        return red, green, blue
+
+    def display(self, rect=None):
+        """Multiply the display by the combined tint, within rect if given."""
+        tint = self.combined_tint()
+        if tint == WHITE:
+            return
+        if tint != self.surface_tint:
+            self.tint_surface.fill(tint)
+            self.surface_tint = tint
+        rect = rect or self.tint_surface.get_rect()
+        self.display_surface.blit(
+            self.tint_surface, rect, rect, special_flags=pygame.BLEND_RGB_MULT
+        )
@@ -0,0 +1,71 @@
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class DirtyRects:
+    """
+    Finds the screen areas that changed between two frames of blits.
+
+    A frame is the list of (surface, position) pairs it draws, in order.
+    When the frame state (camera offset, screen tint) is unchanged, only
+    blits that appeared or disappeared since the previous frame need to be
+    redrawn. Otherwise, or when too much changed, a full redraw is asked for.
+    """
+
+    def __init__(self, max_rects=64, max_area_fraction=0.5):
+        self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.max_rects = max_rects
+        self.max_area = SCREEN_WIDTH * SCREEN_HEIGHT * max_area_fraction
+        self.previous_blits = None
+        self.previous_state = None
+
+    def changed_rects(self, frame_blits, frame_state, force_full=False):
+        """
+        Return the rects to redraw, or None when the whole screen must be.
+
+        A forced full frame may hold drawing that is not among its blits,
+        like the shop menu, so the frame after it is drawn in full as well.
+        """
+        current_blits = None if force_full else set(frame_blits)
+        previous_blits, self.previous_blits = self.previous_blits, current_blits
+        previous_state, self.previous_state = self.previous_state, frame_state
+        if force_full or previous_blits is None or frame_state != previous_state:
+            return None
+
+        rects = []
+        area = 0
+        for surf, position in current_blits.symmetric_difference(previous_blits):
+            rect = surf.get_rect(topleft=position).clip(self.screen_rect)
+            if rect.width and rect.height:
+                rects.append(rect)
+                area += rect.width * rect.height
+        if len(rects) > self.max_rects or area > self.max_area:
+            return None
+        return rects
+
+    def redraw(self, surface, frame_blits, rects, post_process=None):
+        """
+        Clear each rect and draw the blits of the frame that overlap it.
+
+        post_process is called with each rect right after it is redrawn, so
+        full-screen effects apply once even where rects overlap.
+        """
+        blit_rects = [surf.get_rect(topleft=position) for surf, position in frame_blits]
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.fill("black")
+            surface.blits(
+                [frame_blits[index] for index in rect.collidelistall(blit_rects)],
+                doreturn=False,
+            )
+            if post_process:
+                post_process(rect)
+        surface.set_clip(None)
+
+
+def present(changed_rects):
+    """Show a drawn frame: the whole window when changed_rects is None."""
+    if changed_rects is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(changed_rects)
@@ -1,31 +1,76 @@
 import pygame
+from functools import partial
+from itertools import count
 from pathlib import Path
 from random import randint
-from pytmx.util_pygame import load_pygame
 from settings import *
 from player import Player
 from overlay import Overlay
-from sprites import Generic, Water, WildFlower, Tree, Interaction, Particle
+from sprites import Generic, Obstacle, WildFlower, Tree, Interaction, Particle
 from support import import_folder
 from transition import ScreenTransition
 from soil import SoilLayer
 from sky import Rain, Sky
 from menu import Menu
+from chunks import StaticChunks
+from animation import AnimationClock, AnimatedTiles
+from streaming import WorldStreamer
+from spatial import CollisionGroup, SpatialHashGroup
+from assets import assets
+from audio import audio
+from tilemap import load_map
+from profiler import profiler, ProfilerHud
+from timer import Scheduler
+from compositor import TintCompositor
+from dirty import DirtyRects
+from save import Autosaver, read_save, restore
 
 
 class Level:
-    def __init__(self):
-        """Initialize the level, load the display surface, and set up sprite groups."""
+    def __init__(self, save_path=SAVE_PATH):
+        """
+        Initialize the level, load the display surface, and set up sprite groups.
+
+        The game saved at save_path is loaded if there is one, and autosaved
+        there after every night. Pass None to neither load nor save.
+        """
         self.display_surface = pygame.display.get_surface()
         self.sprite_groups = {
             "all": CameraGroup(),
-            "collision": pygame.sprite.Group(),
-            "trees": pygame.sprite.Group(),
-            "interactions": pygame.sprite.Group(),
+            "collision": CollisionGroup(),
+            "trees": SpatialHashGroup(),
+            "interactions": SpatialHashGroup(),
+        }
+
+        self.static_chunks = StaticChunks() if STATIC_CHUNKS else None
+
+        # Looping animations shared by every tile showing them
+        self.animation_clocks = []
+
+        # Map objects are spawned by kind, through the streamer when enabled
+        self.spawners = {
+            "generic": self._spawn_generic,
+            "fence": self._spawn_fence,
+            "tree": self._spawn_tree,
+            "flower": self._spawn_flower,
+            "interaction": self._spawn_interaction,
         }
+        self.streamer = (
+            WorldStreamer(
+                self.spawn_now,
+                self.static_chunks,
+                initial_states={"tree": lambda surf, name: Tree.initial_state(name)},
+            )
+            if WORLD_STREAMING
+            else None
+        )
+
+        # Simulation clock driving every timer and timed sprite of the level
+        self.scheduler = Scheduler()
 
+        self.tmx_data = load_map(MAP_PATH, MAP_CACHE_PATH)
         self.soil_layer = SoilLayer(
-            self.sprite_groups["all"], self.sprite_groups["collision"]
+            self.sprite_groups["all"], self.sprite_groups["collision"], self.tmx_data
         )
         self.setup_level()
         self.overlay = Overlay(self.player)
@@ -37,26 +82,39 @@ class Level:
         self.soil_layer.is_raining = self.is_raining
         self.sky = Sky()
 
+        # Full-screen color modulation, applied in one pass
+        self.compositor = TintCompositor()
+        self.compositor.add_tint(self.sky.tint)
+        self.compositor.add_tint(self.transition.tint)
+        self.dirty_rects = DirtyRects() if DIRTY_RECTS else None
+
         # Shop Menu
-        self.menu = Menu(self.player, self.toggle_shop)
+        self.menu = Menu(self.player, self.toggle_shop, self.scheduler)
         self.is_shop_active = False
 
-        # Sound Effects
-        self.success_sound = pygame.mixer.Sound(
-            current_dir.parent / Path("audio/success.wav")
-        )
-        self.success_sound.set_volume(0.3)
+        # Profiler readout, drawn while profiling is enabled
+        self.profiler_hud = ProfilerHud(profiler, self.sprite_groups["all"])
+
+        # Sound
+        audio.load(in_background=AUDIO_LOAD_IN_BACKGROUND)
+        audio.play_music(MUSIC_PATH, MUSIC_VOLUME)
+
+        # Saving
+        self.autosaver = Autosaver(save_path) if save_path else None
+        if save_path:
+            self.load_game(save_path)
 
     def setup_level(self):
-        """Load the level from the TMX file and initialize sprites."""
-        tmx_data = load_pygame(Path("data/map.tmx"))
-        self.load_environment(tmx_data)
-        self.load_player(tmx_data)
+        """Initialize sprites from the loaded map."""
+        self.load_environment(self.tmx_data)
+        self.load_player(self.tmx_data)
+        if self.streamer:
+            self.streamer.update(self.view_rect(), immediate=True)
 
     def add_item_to_player_inventory(self, item):
         """Add an item to the player's inventory."""
         self.player.inventory_items[item] += 1
-        self.success_sound.play()
+        audio.play("success")
 
     def load_environment(self, tmx_data):
         """Load environment-related sprites."""
@@ -72,6 +130,71 @@ class Level:
             load_layer(tmx_data)
         self.load_ground()
 
+        if self.static_chunks:
+            if not self.streamer:
+                self.static_chunks.bake()
+            for layer in self.static_chunks.layers():
+                self.sprite_groups["all"].add_layer_source(
+                    layer, partial(self.static_chunks.visible_blits, layer)
+                )
+
+    def add_static(self, position, surf, z):
+        """
+        Add a surface that never changes, baked into chunks when enabled.
+
+        Without chunks, static surfaces are never streamed, since the ground
+        covers the whole map.
+        """
+        if self.static_chunks:
+            self.static_chunks.add(position, surf, z)
+        else:
+            self.spawn_now("generic", position, surf, z)
+
+    def spawn(self, kind, position, *args):
+        """Create a map object now, or register it with the streamer."""
+        if self.streamer:
+            self.streamer.add(kind, position, args)
+        else:
+            self.spawn_now(kind, position, *args)
+
+    def spawn_now(self, kind, position, *args):
+        """Create the sprite of a map object and return it."""
+        return self.spawners[kind](position, *args)
+
+    def _spawn_generic(self, position, surf, z=None):
+        return Generic(position, surf, self.sprite_groups["all"], z)
+
+    def _spawn_fence(self, position, surf):
+        return Obstacle(
+            position,
+            surf,
+            [self.sprite_groups["all"], self.sprite_groups["collision"]],
+        )
+
+    def _spawn_tree(self, position, surf, name):
+        return Tree(
+            position=position,
+            surf=surf,
+            groups=[
+                self.sprite_groups["all"],
+                self.sprite_groups["collision"],
+                self.sprite_groups["trees"],
+            ],
+            name=name,
+            add_item=self.add_item_to_player_inventory,
+            scheduler=self.scheduler,
+        )
+
+    def _spawn_flower(self, position, surf):
+        return WildFlower(
+            position,
+            surf,
+            [self.sprite_groups["all"], self.sprite_groups["collision"]],
+        )
+
+    def _spawn_interaction(self, position, size, name):
+        return Interaction(position, size, self.sprite_groups["interactions"], name)
+
     def load_houses(self, tmx_data):
         """Load house-related sprites from the TMX data."""
         house_layers = [
@@ -81,101 +204,78 @@ class Level:
             "HouseFurnitureTop",
         ]
         for layer in house_layers:
-            for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-                z_order = (
-                    LAYERS["house_bottom"]
-                    if layer in ["HouseFloor", "HouseFurnitureBottom"]
-                    else None
-                )
-                Generic(
-                    (x * TILE_SIZE, y * TILE_SIZE),
-                    surf,
-                    self.sprite_groups["all"],
-                    z_order,
-                )
+            for x, y, surf in tmx_data.layer_tiles(layer):
+                position = (x * TILE_SIZE, y * TILE_SIZE)
+                if layer in ["HouseFloor", "HouseFurnitureBottom"]:
+                    self.add_static(position, surf, LAYERS["house_bottom"])
+                else:
+                    # Walls and top furniture are y-sorted against the player
+                    self.spawn("generic", position, surf)
 
     def load_fences(self, tmx_data):
         """Load fence sprites."""
-        for x, y, surf in tmx_data.get_layer_by_name("Fence").tiles():
-            Generic(
-                (x * TILE_SIZE, y * TILE_SIZE),
-                surf,
-                [self.sprite_groups["all"], self.sprite_groups["collision"]],
-            )
+        for x, y, surf in tmx_data.layer_tiles("Fence"):
+            self.spawn("fence", (x * TILE_SIZE, y * TILE_SIZE), surf)
 
     def load_water(self, tmx_data):
-        """Load water sprites."""
-        water_frames = import_folder(Path("graphics/water"))
-        for x, y, _ in tmx_data.get_layer_by_name("Water").tiles():
-            Water(
-                (x * TILE_SIZE, y * TILE_SIZE), water_frames, self.sprite_groups["all"]
-            )
+        """Load the water tiles, animated together by one clock."""
+        water_clock = AnimationClock(import_folder(Path("graphics/water")), 5)
+        self.animation_clocks.append(water_clock)
+        self.water_tiles = AnimatedTiles(water_clock)
+        for x, y, _ in tmx_data.layer_tiles("Water"):
+            self.water_tiles.add((x * TILE_SIZE, y * TILE_SIZE))
+        self.sprite_groups["all"].add_layer_source(
+            LAYERS["water"], self.water_tiles.visible_blits
+        )
 
     def load_trees(self, tmx_data):
         """Load tree sprites."""
-        for obj in tmx_data.get_layer_by_name("Trees"):
-            Tree(
-                position=(obj.x, obj.y),
-                surf=obj.image,
-                groups=[
-                    self.sprite_groups["all"],
-                    self.sprite_groups["collision"],
-                    self.sprite_groups["trees"],
-                ],
-                name=obj.name,
-                add_item=self.add_item_to_player_inventory,
-            )
+        for obj in tmx_data.layer_objects("Trees"):
+            self.spawn("tree", (obj.x, obj.y), obj.image, obj.name)
 
     def load_wildflowers(self, tmx_data):
         """Load wildflower sprites."""
-        for obj in tmx_data.get_layer_by_name("Decoration"):
-            WildFlower(
-                (obj.x, obj.y),
-                obj.image,
-                [self.sprite_groups["all"], self.sprite_groups["collision"]],
-            )
+        for obj in tmx_data.layer_objects("Decoration"):
+            self.spawn("flower", (obj.x, obj.y), obj.image)
 
     def load_collision_tiles(self, tmx_data):
-        """Load collision tiles."""
-        for x, y, _ in tmx_data.get_layer_by_name("Collision").tiles():
-            Generic(
-                (x * TILE_SIZE, y * TILE_SIZE),
-                pygame.Surface((TILE_SIZE, TILE_SIZE)),
-                self.sprite_groups["collision"],
-            )
+        """Load collision tiles into the static collision bitmap."""
+        collision_sprites = self.sprite_groups["collision"]
+        collision_sprites.create_static_grid(tmx_data.width, tmx_data.height)
+        for x, y, _ in tmx_data.layer_tiles("Collision"):
+            collision_sprites.add_static_tile(x, y)
 
     def load_player(self, tmx_data):
         """Load the player sprite from TMX data."""
-        for obj in tmx_data.get_layer_by_name("Player"):
+        for obj in tmx_data.layer_objects("Player"):
             if obj.name == "Start":
                 self.player = Player(
                     position=(obj.x, obj.y),
                     group=self.sprite_groups["all"],
                     collision_sprites=self.sprite_groups["collision"],
-                    tree_sprites=self.sprite_groups["trees"],
-                    interaction=self.sprite_groups["interactions"],
+                    world=self,
                     soil_layer=self.soil_layer,
                     toggle_shop=self.toggle_shop,
+                    scheduler=self.scheduler,
                 )
+                self.sprite_groups["all"].track(self.player)
             elif obj.name in ["Bed", "Trader"]:
-                Interaction(
-                    (obj.x, obj.y),
-                    (obj.width, obj.height),
-                    self.sprite_groups["interactions"],
-                    obj.name,
+                self.spawn(
+                    "interaction", (obj.x, obj.y), (obj.width, obj.height), obj.name
                 )
 
     def load_ground(self):
         """Load the ground sprite."""
-        ground_surface = pygame.image.load(
-            Path("graphics/world/ground.png")
-        ).convert_alpha()
-        Generic(
-            position=(0, 0),
-            surf=ground_surface,
-            groups=self.sprite_groups["all"],
-            z=LAYERS["ground"],
-        )
+        ground_surface = assets.image(Path("graphics/world/ground.png"))
+        self.add_static((0, 0), ground_surface, LAYERS["ground"])
+
+    def trees_at(self, point):
+        """Return the trees whose rect contains point, in map order."""
+        return self.sprite_groups["trees"].query_point(point)
+
+    def interactions_colliding(self, rect):
+        """Return the interactions overlapping rect, in map order."""
+        return self.sprite_groups["interactions"].query_rect(rect)
 
     def toggle_shop(self):
         """Toggle the shop menu state."""
@@ -183,74 +283,304 @@ class Level:
 
     def reset(self):
         """Reset level state and update environment conditions."""
-        self.soil_layer.update_plants()
-        self.soil_layer.remove_water()
-        self.is_raining = randint(0, 10) > 3
-        self.soil_layer.is_raining = self.is_raining
-        if self.is_raining:
-            self.soil_layer.water_all()
+        self.simulate_days(1)
+        self.sky.start_color = [255, 255, 255]
+
+        if self.autosaver:
+            self.autosaver.save(self)
+
+    def simulate_days(self, days):
+        """
+        Advance the world by a number of nights without drawing anything.
+
+        Crops grow and the weather is rolled every night, while sprites and
+        apples are only refreshed for the final day.
+        """
+        rainy_days = [randint(0, 10) > 3 for _ in range(days)]
+        self.soil_layer.simulate_days(rainy_days)
+        if rainy_days:
+            self.is_raining = rainy_days[-1]
+            self.soil_layer.is_raining = self.is_raining
 
         for tree in self.sprite_groups["trees"].sprites():
             for apple in tree.apple_sprites.sprites():
                 apple.kill()
             tree.create_fruit()
+        if self.streamer:
+            self.streamer.update_stored_states("tree", self._regrow_stored_tree)
 
-        self.sky.start_color = [255, 255, 255]
+    @staticmethod
+    def _regrow_stored_tree(record, state):
+        """Grow new apples on the stored state of an unloaded tree."""
+        health, alive, _ = state
+        _, name = record.args
+        return health, alive, Tree.roll_apples(name)
+
+    def tree_states(self):
+        """Return (health, alive, apple offsets) of every map tree, in map order."""
+        if self.streamer:
+            return self.streamer.record_states("tree")
+        return [tree.get_state() for tree in self.sprite_groups["trees"]]
+
+    def restore_tree_states(self, states):
+        """Apply states from tree_states() to the map trees."""
+        if self.streamer:
+            self.streamer.restore_states("tree", states)
+        else:
+            for tree, state in zip(self.sprite_groups["trees"], states):
+                tree.restore(*state)
+
+    def view_rect(self):
+        """Return the screen-sized world rect centered on the player."""
+        view_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        view_rect.center = self.player.rect.center
+        return view_rect
+
+    def load_game(self, path):
+        """Restore the game saved at path, if there is a usable save."""
+        state = read_save(path)
+        if state is not None:
+            restore(self, state)
 
     def check_plant_collision(self):
         """Check for collisions with harvestable plants."""
-        if self.soil_layer.plant_sprites:
-            for plant in self.soil_layer.plant_sprites.sprites():
-                if plant.harvestable and plant.rect.colliderect(self.player.hitbox):
-                    self.add_item_to_player_inventory(plant.plant_type)
-                    plant.kill()
-                    Particle(
-                        plant.rect.topleft,
-                        plant.image,
-                        self.sprite_groups["all"],
-                        z=LAYERS["main"],
-                    )
-                    self.soil_layer.grid[plant.rect.centery // TILE_SIZE][
-                        plant.rect.centerx // TILE_SIZE
-                    ].remove("P")
+        for plant in self.soil_layer.plants_colliding(self.player.hitbox):
+            if plant.harvestable:
+                self.add_item_to_player_inventory(plant.plant_type)
+                self.soil_layer.remove_plant(plant)
+                Particle(
+                    plant.rect.topleft,
+                    plant.image,
+                    self.sprite_groups["all"],
+                    z=LAYERS["main"],
+                    scheduler=self.scheduler,
+                )
 
     def run(self, delta_time):
-        """Update and draw the level."""
-        self.display_surface.fill("black")
-        self.sprite_groups["all"].custom_draw(self.player)
+        """Update and draw the level, returning the changed screen rects."""
+        self.update(delta_time)
+        return self.draw()
 
-        if self.is_shop_active:
-            self.menu.update()
-        else:
-            self.sprite_groups["all"].update(delta_time)
-            self.check_plant_collision()
+    def update(self, delta_time):
+        """Advance the simulation by delta_time seconds."""
+        with profiler.span("update"):
+            self.sprite_groups["all"].store_positions()
+            with profiler.span("update.timers"):
+                self.scheduler.advance(delta_time * 1000)
+            if self.streamer:
+                with profiler.span("update.streaming"):
+                    self.streamer.update(self.view_rect())
+
+            if self.is_shop_active:
+                with profiler.span("update.menu"):
+                    self.menu.update()
+            else:
+                with profiler.span("update.animation"):
+                    for clock in self.animation_clocks:
+                        clock.update(delta_time)
+                with profiler.span("update.sprites"):
+                    self.sprite_groups["all"].update(delta_time)
+                with profiler.span("update.plant_collision"):
+                    self.check_plant_collision()
+                with profiler.span("update.rain"):
+                    self.rain.update(delta_time, self.is_raining)
 
-        self.overlay.display()
-        if self.is_raining and not self.is_shop_active:
-            self.rain.update()
-        self.sky.display(delta_time)
+            with profiler.span("update.sky"):
+                self.sky.update(delta_time)
+            if self.player.is_sleeping:
+                with profiler.span("update.transition"):
+                    self.transition.update(delta_time)
 
-        if self.player.is_sleeping:
-            self.transition.play_transition()
+    def draw(self, alpha=1.0):
+        """
+        Draw the level.
+
+        alpha is the fraction of a simulation tick elapsed since the last
+        update, used to interpolate moving sprites. Returns the screen rects
+        that were redrawn, or None when the whole screen was.
+        """
+        camera = self.sprite_groups["all"]
+        changed_rects = None
+        with profiler.span("draw"):
+            with profiler.span("draw.camera"):
+                layer_blits = camera.collect_blits(self.player, alpha)
+
+            if self.dirty_rects:
+                frame_blits = [blit for blits in layer_blits for blit in blits]
+                frame_blits += self.overlay.blits()
+                frame_state = (
+                    int(camera.offset.x),
+                    int(camera.offset.y),
+                    self.compositor.combined_tint(),
+                    self.is_shop_active,
+                    profiler.enabled,
+                )
+                changed_rects = self.dirty_rects.changed_rects(
+                    frame_blits,
+                    frame_state,
+                    force_full=self.is_shop_active or profiler.enabled,
+                )
+
+            if changed_rects is None:
+                self.display_surface.fill("black")
+                with profiler.span("draw.blits"):
+                    for blits in layer_blits:
+                        self.display_surface.blits(blits, doreturn=False)
+
+                if self.is_shop_active:
+                    with profiler.span("draw.menu"):
+                        self.menu.display()
+
+                with profiler.span("draw.overlay"):
+                    self.overlay.display()
+                with profiler.span("draw.tint"):
+                    self.compositor.display()
+            else:
+                with profiler.span("draw.dirty"):
+                    self.dirty_rects.redraw(
+                        self.display_surface,
+                        frame_blits,
+                        changed_rects,
+                        self.compositor.display,
+                    )
+
+        if profiler.enabled:
+            camera = self.sprite_groups["all"]
+            profiler.count("sprites", len(camera))
+            profiler.count("blits", sum(camera.blit_counts.values()))
+            self.profiler_hud.display()
+
+        return changed_rects
 
 
 class CameraGroup(pygame.sprite.Group):
+    """
+    Sprite group that lays out its sprites for drawing relative to the player.
+
+    Sprites are kept in one bucket per z-layer. Each bucket stays in draw order
+    between frames, so re-sorting it after sprites move is close to linear.
+    """
+
     def __init__(self):
-        """Initialize the camera group with the display surface."""
+        """Initialize the camera group with empty layer buckets."""
         super().__init__()
-        self.display_surface = pygame.display.get_surface()
         self.offset = pygame.math.Vector2()
+        self.layers = {layer: [] for layer in LAYERS.values()}
+        self.sprite_layers = {}
+        self.incoming = []
+        self.draw_order = {}
+        self.draw_counter = count()
+        self.layer_sources = {}
+        self.blit_counts = {}
+        self.tracked_positions = {}
+        self.render_positions = {}
+
+    def add_internal(self, sprite, layer=None):
+        """Queue the sprite until its z-layer is known."""
+        super().add_internal(sprite, layer)
+        self.draw_order[sprite] = next(self.draw_counter)
+        self.sprite_layers[sprite] = None
+        self.incoming.append(sprite)
+
+    def remove_internal(self, sprite):
+        """Drop the sprite from its bucket."""
+        super().remove_internal(sprite)
+        del self.draw_order[sprite]
+        layer = self.sprite_layers.pop(sprite)
+        bucket = self.incoming if layer is None else self.layers[layer]
+        bucket.remove(sprite)
+
+    def add_layer_source(self, layer, source):
+        """
+        Register a callable drawn beneath the sprites of a layer.
+
+        The source is called as source(view_rect, offset_x, offset_y) and
+        returns (surface, screen_position) pairs.
+        """
+        self.layer_sources.setdefault(layer, []).append(source)
+
+    def track(self, sprite):
+        """Interpolate the drawn position of a moving sprite between ticks."""
+        self.tracked_positions[sprite] = sprite.rect.topleft
+
+    def store_positions(self):
+        """Remember tracked sprite positions before a simulation tick."""
+        for sprite in self.tracked_positions:
+            self.tracked_positions[sprite] = sprite.rect.topleft
 
-    def custom_draw(self, player):
-        """Draw sprites with camera offset."""
-        self.offset.x = player.rect.centerx - SCREEN_WIDTH / 2
-        self.offset.y = player.rect.centery - SCREEN_HEIGHT / 2
+    def _interpolated_positions(self, alpha):
+        """Return the drawn topleft of tracked sprites that moved this tick."""
+        positions = {}
+        if alpha < 1:
+            for sprite, (previous_x, previous_y) in self.tracked_positions.items():
+                x, y = sprite.rect.topleft
+                if (x, y) != (previous_x, previous_y):
+                    positions[sprite] = (
+                        round(previous_x + (x - previous_x) * alpha),
+                        round(previous_y + (y - previous_y) * alpha),
+                    )
+        return positions
+
+    def _file_sprite(self, sprite):
+        """Place a sprite in the bucket matching its current z."""
+        self.sprite_layers[sprite] = sprite.z
+        self.layers.setdefault(sprite.z, []).append(sprite)
+
+    def sort_key(self, sprite):
+        """Order sprites by their vertical center, then by insertion order."""
+        return sprite.rect.centery, self.draw_order[sprite]
+
+    def collect_blits(self, player, alpha=1.0):
+        """Return the (surface, screen position) pairs of each layer in order."""
+        self.render_positions = self._interpolated_positions(alpha)
+        player_x, player_y = self.render_positions.get(player, player.rect.topleft)
+        self.offset.x = player_x + player.rect.width // 2 - SCREEN_WIDTH / 2
+        self.offset.y = player_y + player.rect.height // 2 - SCREEN_HEIGHT / 2
+        offset_x, offset_y = int(self.offset.x), int(self.offset.y)
+        view_rect = pygame.Rect(offset_x, offset_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        for sprite in self.incoming:
+            self._file_sprite(sprite)
+        self.incoming.clear()
+
+        # Sprites that changed z are moved between buckets while collecting.
+        # A bucket that receives a sprite after it was collected is collected
+        # again, so the frame always matches a full sort.
+        blit_sequences = {}
+        pending = sorted(LAYERS.values())
+        while pending:
+            layer = pending.pop(0)
+            blit_sequences[layer], moved = self._collect_layer(
+                layer, view_rect, offset_x, offset_y
+            )
+            for sprite in moved:
+                self._file_sprite(sprite)
+                if sprite.z in blit_sequences and sprite.z not in pending:
+                    pending.append(sprite.z)
+                    pending.sort()
 
         for layer in LAYERS.values():
-            for sprite in sorted(
-                self.sprites(), key=lambda sprite: sprite.rect.centery
-            ):
-                if sprite.z == layer:
-                    offset_rect = sprite.rect.copy()
-                    offset_rect.center -= self.offset
-                    self.display_surface.blit(sprite.image, offset_rect)
+            self.blit_counts[layer] = len(blit_sequences[layer])
+        return [blit_sequences[layer] for layer in LAYERS.values()]
+
+    def _collect_layer(self, layer, view_rect, offset_x, offset_y):
+        """Sort a layer bucket and return the blits of its visible sprites."""
+        bucket = self.layers[layer]
+        bucket.sort(key=self.sort_key)
+
+        blit_sequence = []
+        for source in self.layer_sources.get(layer, ()):
+            blit_sequence.extend(source(view_rect, offset_x, offset_y))
+
+        render_positions = self.render_positions
+        moved = []
+        for sprite in bucket:
+            if sprite.z != layer:
+                moved.append(sprite)
+            elif sprite.rect.colliderect(view_rect):
+                x, y = render_positions.get(sprite, sprite.rect.topleft)
+                blit_sequence.append((sprite.image, (x - offset_x, y - offset_y)))
+
+        for sprite in moved:
+            bucket.remove(sprite)
+        return blit_sequence, moved
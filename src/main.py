@@ -1,7 +1,22 @@
 import sys
 import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FIXED_TIMESTEP,
+    SIMULATION_RATE,
+    FPS_CAP,
+    MAX_CATCH_UP_TICKS,
+    INTERPOLATE_RENDERING,
+    PROFILER_TRACE_PATH,
+    ASSET_PACK_PATH,
+    ASSET_PRELOAD_FOLDERS,
+    ASSET_DECODE_WORKERS,
+)
+from assets import assets
+from dirty import present
 from level import Level
+from profiler import profiler
 
 
 class Game:
@@ -11,21 +26,61 @@ class Game:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Sprout Land")
         self.clock = pygame.time.Clock()
+
+        # Images come from the asset pack, or from PNGs decoded in parallel
+        # where the pack is missing or out of date. The preload folders also
+        # hold images the game never uses, which are freed once it is built.
+        assets.load_pack(ASSET_PACK_PATH)
+        assets.preload(ASSET_PRELOAD_FOLDERS, ASSET_DECODE_WORKERS)
         self.level = Level()
+        assets.drop_preloaded()
+
+        # Fixed timestep state
+        self.tick_length = 1 / SIMULATION_RATE
+        self.accumulated_time = 0
 
     def run(self):
         while True:
+            profiler.begin_frame()
             self._handle_events()
-            delta_time = self.clock.tick() / 1000
-            self.level.run(delta_time)
-            pygame.display.update()
+            if FIXED_TIMESTEP:
+                changed_rects = self._run_fixed_ticks()
+            else:
+                delta_time = self.clock.tick(FPS_CAP) / 1000
+                changed_rects = self.level.run(delta_time)
+            with profiler.span("present"):
+                present(changed_rects)
+
+    def _run_fixed_ticks(self):
+        """Run the simulation ticks due since the last frame, then draw."""
+        self.accumulated_time += self.clock.tick(FPS_CAP) / 1000
+
+        ticks = 0
+        while self.accumulated_time >= self.tick_length and ticks < MAX_CATCH_UP_TICKS:
+            self.level.update(self.tick_length)
+            self.accumulated_time -= self.tick_length
+            ticks += 1
+
+        # Drop the backlog of a frame that was too slow to catch up with
+        if self.accumulated_time >= self.tick_length:
+            self.accumulated_time %= self.tick_length
+
+        alpha = self.accumulated_time / self.tick_length if INTERPOLATE_RENDERING else 1
+        return self.level.draw(alpha)
 
     def _handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self._quit_game()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_F4 and profiler.enabled:
+                    profiler.write_trace(PROFILER_TRACE_PATH)
 
     def _quit_game(self):
+        if self.level.autosaver:
+            self.level.autosaver.wait()
         pygame.quit()
         sys.exit()
 
@@ -5,7 +5,7 @@ from settings import SCREEN_WIDTH, SCREEN_HEIGHT, SALE_PRICES, PURCHASE_PRICES
 
 
 class Menu:
-    def __init__(self, player, toggle_menu):
+    def __init__(self, player, toggle_menu, scheduler):
         """Initialize the menu with player and toggle function."""
         self.player = player
         self.toggle_menu = toggle_menu
@@ -17,6 +17,9 @@ class Menu:
         self.space_between_items = 10
         self.padding = 8
 
+        # Rendered text by string, shared by labels and amounts
+        self.rendered_text = {}
+
         # Menu options
         self.options = self._get_menu_options()
         self.sell_border_index = len(self.player.inventory_items) - 1
@@ -24,9 +27,16 @@ class Menu:
         self.total_menu_height = 0
         self._setup_menu()
 
+        # Entries are drawn into a cached panel, each row redrawn only when
+        # its amount or selection changes
+        self.panel_surface = pygame.Surface(self.menu_rect.size, pygame.SRCALPHA)
+        self.row_states = [None] * len(self.options)
+        self.money_label = None
+        self.money_label_value = None
+
         # Menu navigation
         self.selected_index = 0
-        self.input_timer = Timer(200)
+        self.input_timer = Timer(200, scheduler)
 
     def _get_menu_options(self):
         """Retrieve available menu options from the player's inventory."""
@@ -34,22 +44,35 @@ class Menu:
             self.player.seed_inventory.keys()
         )
 
+    def render_text(self, text):
+        """Return the rendered surface for text, rendering it on first use."""
+        if text not in self.rendered_text:
+            self.rendered_text[text] = self.font.render(text, True, "black")
+        return self.rendered_text[text]
+
     def display_money(self):
-        """Render and display the player's current money."""
-        money_surface = self.font.render(f"${self.player.money}", True, "black")
-        money_rect = money_surface.get_rect(
-            midbottom=(SCREEN_WIDTH / 2, SCREEN_HEIGHT - 20)
-        )
+        """Display the player's current money, rebuilding it when it changes."""
+        if self.money_label_value != self.player.money:
+            money_surface = self.font.render(f"${self.player.money}", True, "black")
+            money_rect = money_surface.get_rect(
+                midbottom=(SCREEN_WIDTH / 2, SCREEN_HEIGHT - 20)
+            )
+            label_rect = money_rect.inflate(10, 10)
 
-        pygame.draw.rect(
-            self.display_surface, "white", money_rect.inflate(10, 10), 0, 4
-        )
-        self.display_surface.blit(money_surface, money_rect)
+            label_surface = pygame.Surface(label_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(label_surface, "white", label_surface.get_rect(), 0, 4)
+            label_surface.blit(
+                money_surface, money_rect.move(-label_rect.x, -label_rect.y)
+            )
+            self.money_label = (label_surface, label_rect)
+            self.money_label_value = self.player.money
+
+        self.display_surface.blit(*self.money_label)
 
     def _setup_menu(self):
         """Prepare menu layout and item text surfaces."""
         for item in self.options:
-            text_surface = self.font.render(item, True, "black")
+            text_surface = self.render_text(item)
             self.text_surfaces.append(text_surface)
             self.total_menu_height += text_surface.get_height() + self.padding * 2
 
@@ -66,13 +89,12 @@ class Menu:
         )
 
         # Create buy/sell text surfaces
-        self.buy_text_surface = self.font.render("buy", True, "black")
-        self.sell_text_surface = self.font.render("sell", True, "black")
+        self.buy_text_surface = self.render_text("buy")
+        self.sell_text_surface = self.render_text("sell")
 
     def handle_input(self):
         """Process user input for menu navigation and item selection."""
         keys = pygame.key.get_pressed()
-        self.input_timer.update()
 
         if keys[pygame.K_ESCAPE]:
             self.toggle_menu()
@@ -109,59 +131,69 @@ class Menu:
                 self.player.seed_inventory[current_item] += 1
                 self.player.money -= seed_price
 
+    def get_amount(self, index):
+        """Return the amount shown for the option at index."""
+        item = self.options[index]
+        if index <= self.sell_border_index:
+            return self.player.inventory_items[item]
+        return self.player.seed_inventory[item]
+
     def show_entry(self, text_surface, amount, top_position, is_selected):
-        """Render a single menu entry with amount and selection state."""
-        # Background rectangle
+        """Render a single menu entry into the panel, replacing the old one."""
+        # Background rectangle, in panel coordinates
         background_rect = pygame.Rect(
-            self.menu_rect.left,
-            top_position,
+            0,
+            top_position - self.menu_rect.top,
             self.menu_width,
             text_surface.get_height() + (self.padding * 2),
         )
-        pygame.draw.rect(self.display_surface, "white", background_rect, 0, 4)
+        self.panel_surface.fill((0, 0, 0, 0), background_rect)
+        pygame.draw.rect(self.panel_surface, "white", background_rect, 0, 4)
 
         # Render text
-        text_rect = text_surface.get_rect(
-            midleft=(self.menu_rect.left + 20, background_rect.centery)
-        )
-        self.display_surface.blit(text_surface, text_rect)
+        text_rect = text_surface.get_rect(midleft=(20, background_rect.centery))
+        self.panel_surface.blit(text_surface, text_rect)
 
         # Render amount
-        amount_surface = self.font.render(str(amount), True, "black")
+        amount_surface = self.render_text(str(amount))
         amount_rect = amount_surface.get_rect(
-            midright=(self.menu_rect.right - 20, background_rect.centery)
+            midright=(self.menu_width - 20, background_rect.centery)
         )
-        self.display_surface.blit(amount_surface, amount_rect)
+        self.panel_surface.blit(amount_surface, amount_rect)
 
         # Highlight selected entry
         if is_selected:
-            pygame.draw.rect(self.display_surface, "black", background_rect, 4, 4)
+            pygame.draw.rect(self.panel_surface, "black", background_rect, 4, 4)
             action_text_surface = (
                 self.sell_text_surface
                 if self.selected_index <= self.sell_border_index
                 else self.buy_text_surface
             )
             action_rect = action_text_surface.get_rect(
-                midleft=(self.menu_rect.left + 175, background_rect.centery)
+                midleft=(175, background_rect.centery)
             )
-            self.display_surface.blit(action_text_surface, action_rect)
+            self.panel_surface.blit(action_text_surface, action_rect)
 
     def update(self):
-        """Update the menu by processing input and rendering items."""
+        """Update the menu by processing input."""
         self.handle_input()
+
+    def display(self):
+        """Render the money label and the menu panel."""
         self.display_money()
 
         for index, text_surface in enumerate(self.text_surfaces):
+            state = (self.get_amount(index), self.selected_index == index)
+            if state == self.row_states[index]:
+                continue
+            self.row_states[index] = state
+
             top_position = self.menu_rect.top + index * (
                 text_surface.get_height()
                 + (self.padding * 2)
                 + self.space_between_items
             )
+            amount, is_selected = state
+            self.show_entry(text_surface, amount, top_position, is_selected)
 
-            amount_list = list(self.player.inventory_items.values()) + list(
-                self.player.seed_inventory.values()
-            )
-            amount = amount_list[index]
-            self.show_entry(
-                text_surface, amount, top_position, self.selected_index == index
-            )
+        self.display_surface.blit(self.panel_surface, self.menu_rect)
@@ -1,6 +1,7 @@
 import pygame
 from pathlib import Path
 from settings import OVERLAY_POSITIONS
+from assets import assets
 
 
 class Overlay:
@@ -20,18 +21,26 @@ class Overlay:
 
     def _load_image(self, file_path):
         """Load a single image and convert it to alpha."""
-        return pygame.image.load(file_path).convert_alpha()
+        return assets.image(file_path)
 
     def display(self):
         """Display the current tool and seed overlays."""
-        self._draw_overlay(
-            self.tool_surfaces[self.player.selected_tool], OVERLAY_POSITIONS["tool"]
-        )
-        self._draw_overlay(
-            self.seed_surfaces[self.player.selected_seed], OVERLAY_POSITIONS["seed"]
-        )
-
-    def _draw_overlay(self, surface, position):
-        """Draw the overlay surface at the specified position."""
+        self.display_surface.blits(self.blits(), doreturn=False)
+
+    def blits(self):
+        """Return (surface, position) pairs for the current tool and seed."""
+        return [
+            self._overlay_blit(
+                self.tool_surfaces[self.player.selected_tool],
+                OVERLAY_POSITIONS["tool"],
+            ),
+            self._overlay_blit(
+                self.seed_surfaces[self.player.selected_seed],
+                OVERLAY_POSITIONS["seed"],
+            ),
+        ]
+
+    def _overlay_blit(self, surface, position):
+        """Return the blit placing the overlay surface at the position."""
         rect = surface.get_rect(midbottom=position)
-        self.display_surface.blit(surface, rect)
+        return surface, rect.topleft
@@ -3,6 +3,8 @@ from pathlib import Path
 from settings import LAYERS, PLAYER_TOOL_OFFSET
 from support import import_folder
 from timer import Timer
+from audio import audio
+from profiler import profiler
 
 
 class Player(pygame.sprite.Sprite):
@@ -11,10 +13,10 @@ class Player(pygame.sprite.Sprite):
         position,
         group,
         collision_sprites,
-        tree_sprites,
-        interaction,
+        world,
         soil_layer,
         toggle_shop,
+        scheduler,
     ):
         super().__init__(group)
 
@@ -32,16 +34,19 @@ class Player(pygame.sprite.Sprite):
         self.position = pygame.math.Vector2(self.rect.center)
         self.speed = 200
 
+        # Input, replaceable by any callable returning a key state sequence
+        self.input_source = pygame.key.get_pressed
+
         # Collision
         self.collision_sprites = collision_sprites
         self.hitbox = self.rect.copy().inflate((-126, -70))
 
         # Initialize timers for tool and seed usage
         self.timers = {
-            "tool_use": Timer(350, self.use_tool),
-            "tool_switch": Timer(200),
-            "seed_use": Timer(350, self.use_seed),
-            "seed_switch": Timer(200),
+            "tool_use": Timer(350, scheduler, self.use_tool),
+            "tool_switch": Timer(200, scheduler),
+            "seed_use": Timer(350, scheduler, self.use_seed),
+            "seed_switch": Timer(200, scheduler),
         }
 
         # Initialize tools and seeds
@@ -58,22 +63,12 @@ class Player(pygame.sprite.Sprite):
         self.seed_inventory = {item: 5 for item in self.seeds}
         self.money = 200
 
-        # Interaction
-        self.tree_sprites = tree_sprites
-        self.interaction = interaction
+        # Interaction, through the level's world queries
+        self.world = world
         self.is_sleeping = False
         self.soil_layer = soil_layer
         self.toggle_shop = toggle_shop
 
-        # Sounds
-        self.watering_sound = self._load_sound("audio/water.mp3")
-
-    def _load_sound(self, file_path):
-        """Load a sound from the given file path."""
-        sound = pygame.mixer.Sound(Path(file_path))
-        sound.set_volume(0.2)
-        return sound
-
     def use_tool(self):
         """Use the selected tool."""
         if self.selected_tool == "hoe":
@@ -82,13 +77,12 @@ class Player(pygame.sprite.Sprite):
             self._damage_tree()
         elif self.selected_tool == "water":
             self.soil_layer.water(self.target_position)
-            self.watering_sound.play()
+            audio.play("water")
 
     def _damage_tree(self):
         """Damage the tree at the target position."""
-        for tree in self.tree_sprites.sprites():
-            if tree.rect.collidepoint(self.target_position):
-                tree.damage()
+        for tree in self.world.trees_at(self.target_position):
+            tree.damage()
 
     def get_target_position(self):
         """Calculate the target position based on the player's current status."""
@@ -144,7 +138,7 @@ class Player(pygame.sprite.Sprite):
 
     def _handle_input(self):
         """Handle player input for movement and actions."""
-        keys = pygame.key.get_pressed()
+        keys = self.input_source()
 
         if not self.timers["tool_use"].is_active and not self.is_sleeping:
             self.handle_movement(keys)
@@ -156,9 +150,7 @@ class Player(pygame.sprite.Sprite):
 
     def _handle_interaction(self):
         """Handle player interaction with nearby sprites."""
-        collided_interaction_sprite = pygame.sprite.spritecollide(
-            self, self.interaction, False
-        )
+        collided_interaction_sprite = self.world.interactions_colliding(self.rect)
         if collided_interaction_sprite:
             if collided_interaction_sprite[0].name == "Trader":
                 self.toggle_shop()
@@ -218,38 +210,33 @@ class Player(pygame.sprite.Sprite):
         if self.timers["tool_use"].is_active:
             self.status = f"{self.status.split('_')[0]}_{self.selected_tool}"
 
-    def _update_timers(self):
-        """Update all active timers."""
-        for timer in self.timers.values():
-            timer.update()
-
     def _collision(self, direction):
         """Handle collision based on movement direction."""
-        for sprite in self.collision_sprites.sprites():
-            if hasattr(sprite, "hitbox") and sprite.hitbox.colliderect(self.hitbox):
-                self.resolve_collision(direction, sprite)
+        for hitbox in self.collision_sprites.hitboxes_near(self.hitbox):
+            if hitbox.colliderect(self.hitbox):
+                self.resolve_collision(direction, hitbox)
 
-    def resolve_collision(self, direction, sprite):
+    def resolve_collision(self, direction, hitbox):
         """Resolve collision with the specified direction."""
         if direction == "horizontal":
-            self._resolve_horizontal_collision(sprite)
+            self._resolve_horizontal_collision(hitbox)
         elif direction == "vertical":
-            self._resolve_vertical_collision(sprite)
+            self._resolve_vertical_collision(hitbox)
 
-    def _resolve_horizontal_collision(self, sprite):
-        """Resolve horizontal collision with another sprite."""
+    def _resolve_horizontal_collision(self, hitbox):
+        """Resolve horizontal collision with another hitbox."""
         if self.direction.x > 0:  # Moving right
-            self.hitbox.right = sprite.hitbox.left
+            self.hitbox.right = hitbox.left
         elif self.direction.x < 0:  # Moving left
-            self.hitbox.left = sprite.hitbox.right
+            self.hitbox.left = hitbox.right
         self._update_position()
 
-    def _resolve_vertical_collision(self, sprite):
-        """Resolve vertical collision with another sprite."""
+    def _resolve_vertical_collision(self, hitbox):
+        """Resolve vertical collision with another hitbox."""
         if self.direction.y > 0:  # Moving down
-            self.hitbox.bottom = sprite.hitbox.top
+            self.hitbox.bottom = hitbox.top
         elif self.direction.y < 0:  # Moving up
-            self.hitbox.top = sprite.hitbox.bottom
+            self.hitbox.top = hitbox.bottom
         self._update_position()
 
     def _update_position(self):
@@ -283,9 +270,12 @@ class Player(pygame.sprite.Sprite):
 
     def update(self, delta_time):
         """Update the player state based on delta time."""
-        self._handle_input()
-        self._update_status()
-        self._update_timers()
-        self.get_target_position()
-        self._move(delta_time)
-        self.animate(delta_time)
+        with profiler.span("player.input"):
+            self._handle_input()
+        with profiler.span("player.status"):
+            self._update_status()
+            self.get_target_position()
+        with profiler.span("player.move"):
+            self._move(delta_time)
+        with profiler.span("player.animate"):
+            self.animate(delta_time)
@@ -0,0 +1,176 @@
+import json
+import pygame
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from time import perf_counter_ns
+from settings import LAYERS, PROFILER_ENABLED, PROFILER_TRACE_FRAMES
+
+# Shared no-op span handed out while profiling is disabled
+NULL_SPAN = nullcontext()
+
+# Weight of the latest frame in the smoothed HUD figures
+SMOOTHING = 0.1
+
+
+class Span:
+    """Context manager timing one named stage of a frame."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.spans.append((self.name, self.start, perf_counter_ns()))
+
+
+class FrameProfiler:
+    """
+    Times named spans per frame while enabled.
+
+    The spans of the last trace_frames frames are kept for export as a
+    Chrome trace. While disabled, span() returns a shared no-op context
+    manager and nothing is recorded.
+    """
+
+    def __init__(self, enabled=False, trace_frames=300):
+        self.enabled = enabled
+        self.frames = deque(maxlen=trace_frames)
+        self.spans = []
+        self.counters = {}
+        self.frame_start = None
+        self.stage_ms = {}
+        self.frame_interval_ms = 0
+        self.epoch = perf_counter_ns()
+
+    def toggle(self):
+        """Switch profiling on or off, starting over with empty history."""
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.spans = []
+        self.counters = {}
+        self.frame_start = None
+        self.stage_ms = {}
+        self.frame_interval_ms = 0
+
+    def span(self, name):
+        """Return a context manager timing the enclosed code as name."""
+        if self.enabled:
+            return Span(self, name)
+        return NULL_SPAN
+
+    def count(self, name, value):
+        """Record a per-frame counter such as the number of blits."""
+        if self.enabled:
+            self.counters[name] = value
+
+    def begin_frame(self):
+        """Start a new frame, closing the previous one."""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self.frame_start is not None:
+            self._end_frame(now)
+        else:
+            self.spans = []
+            self.counters = {}
+        self.frame_start = now
+
+    def fps(self):
+        """Return the smoothed frames per second."""
+        if self.frame_interval_ms:
+            return 1000 / self.frame_interval_ms
+        return 0
+
+    def write_trace(self, path):
+        """Write the kept frames as a Chrome trace-event JSON file."""
+        events = []
+        for start, end, spans, counters in self.frames:
+            events.append(self._trace_event("frame", start, end))
+            events.extend(self._trace_event(*span) for span in spans)
+            events.extend(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": (start - self.epoch) / 1000,
+                    "pid": 1,
+                    "args": {name: value},
+                }
+                for name, value in counters.items()
+            )
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def _end_frame(self, end):
+        """Store the finished frame and fold it into the smoothed figures."""
+        self.frames.append((self.frame_start, end, self.spans, self.counters))
+
+        totals = dict.fromkeys(self.stage_ms, 0)
+        for name, start, stop in self.spans:
+            totals[name] = totals.get(name, 0) + stop - start
+        for name, total in totals.items():
+            previous = self.stage_ms.get(name, total / 1e6)
+            self.stage_ms[name] = previous + (total / 1e6 - previous) * SMOOTHING
+
+        interval = (end - self.frame_start) / 1e6
+        if self.frame_interval_ms:
+            interval = (
+                self.frame_interval_ms + (interval - self.frame_interval_ms) * SMOOTHING
+            )
+        self.frame_interval_ms = interval
+
+        self.spans = []
+        self.counters = {}
+
+    def _trace_event(self, name, start, end):
+        """Return a complete ("X") trace event in microseconds."""
+        return {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.epoch) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": 1,
+            "tid": 1,
+        }
+
+
+class ProfilerHud:
+    """On-screen readout of the profiler and the camera's per-layer counts."""
+
+    def __init__(self, profiler, camera_group):
+        self.display_surface = pygame.display.get_surface()
+        self.profiler = profiler
+        self.camera_group = camera_group
+        self.font = pygame.font.Font(Path("font/LycheeSoda.ttf"), 20)
+        self.layer_names = {layer: name for name, layer in LAYERS.items()}
+
+    def display(self):
+        """Draw the FPS, stage times and per-layer sprite and blit counts."""
+        lines = [f"FPS {self.profiler.fps():.0f}"]
+        lines += [
+            f"{name} {ms:.2f} ms" for name, ms in sorted(self.profiler.stage_ms.items())
+        ]
+        blit_counts = self.camera_group.blit_counts
+        lines += [
+            f"{self.layer_names.get(layer, layer)} "
+            f"{len(bucket)} sprites {blit_counts.get(layer, 0)} blits"
+            for layer, bucket in sorted(self.camera_group.layers.items())
+        ]
+
+        text_surfaces = [self.font.render(line, True, "white") for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(surf.get_width() for surf in text_surfaces) + 20
+        panel = pygame.Surface((width, line_height * len(lines) + 20), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for index, surf in enumerate(text_surfaces):
+            panel.blit(surf, (10, 10 + index * line_height))
+        self.display_surface.blit(panel, (10, 10))
+
+
+profiler = FrameProfiler(PROFILER_ENABLED, PROFILER_TRACE_FRAMES)
@@ -0,0 +1,260 @@
+import numpy as np
+import os
+import struct
+import threading
+from collections import namedtuple
+from soil import PLANTED, PLANT_TYPES
+
+SAVE_MAGIC = b"SPLD"
+SAVE_VERSION = 1
+
+# magic, version, grid rows, grid columns, plants, trees, apples, money,
+# player x, player y, is raining
+HEADER = struct.Struct("<4sHHHIHIiii?")
+NAMES_LENGTH = struct.Struct("<H")
+
+PLANT_RECORD = np.dtype([("x", "<u2"), ("y", "<u2"), ("type", "u1"), ("age", "<f4")])
+TREE_RECORD = np.dtype([("health", "u1"), ("alive", "u1")])
+APPLE_RECORD = np.dtype([("tree", "<u2"), ("x", "<i2"), ("y", "<i2")])
+COUNT_RECORD = np.dtype("<u4")
+
+GameState = namedtuple(
+    "GameState",
+    "grid plant_types plants trees apples money position inventory "
+    "seed_inventory is_raining",
+)
+
+
+def snapshot(level):
+    """
+    Copy the persistent state of a level into plain arrays and values.
+
+    The snapshot shares nothing with the level, so it can be encoded and
+    written on another thread while the game goes on.
+    """
+    soil_layer = level.soil_layer
+    player = level.player
+
+    rows, columns = np.nonzero(soil_layer.grid & PLANTED)
+    plants = np.empty(len(rows), dtype=PLANT_RECORD)
+    plants["x"] = columns
+    plants["y"] = rows
+    plants["type"] = soil_layer.crop_types[rows, columns]
+    plants["age"] = soil_layer.crop_ages[rows, columns]
+
+    trees = level.tree_states()
+    tree_records = np.array(
+        [(health, alive) for health, alive, _ in trees], dtype=TREE_RECORD
+    )
+    apples = np.array(
+        [
+            (index, x, y)
+            for index, (_, _, apple_offsets) in enumerate(trees)
+            for x, y in apple_offsets
+        ],
+        dtype=APPLE_RECORD,
+    )
+
+    return GameState(
+        grid=soil_layer.grid.copy(),
+        plant_types=list(PLANT_TYPES),
+        plants=plants,
+        trees=tree_records,
+        apples=apples,
+        money=player.money,
+        position=player.hitbox.center,
+        inventory=dict(player.inventory_items),
+        seed_inventory=dict(player.seed_inventory),
+        is_raining=level.is_raining,
+    )
+
+
+def encode(state):
+    """Pack a GameState into the binary save format."""
+    rows, columns = state.grid.shape
+    parts = [
+        HEADER.pack(
+            SAVE_MAGIC,
+            SAVE_VERSION,
+            rows,
+            columns,
+            len(state.plants),
+            len(state.trees),
+            len(state.apples),
+            state.money,
+            *state.position,
+            state.is_raining,
+        ),
+        state.grid.astype(np.uint8).tobytes(),
+        state.plants.tobytes(),
+        state.trees.tobytes(),
+        state.apples.tobytes(),
+        _pack_names(state.plant_types),
+    ]
+    for inventory in (state.inventory, state.seed_inventory):
+        parts.append(_pack_names(inventory))
+        parts.append(np.array(list(inventory.values()), dtype=COUNT_RECORD).tobytes())
+    return b"".join(parts)
+
+
+def decode(data):
+    """Unpack a save into a GameState, or return None if it is unusable."""
+    try:
+        (
+            magic,
+            version,
+            rows,
+            columns,
+            plant_count,
+            tree_count,
+            apple_count,
+            money,
+            player_x,
+            player_y,
+            is_raining,
+        ) = HEADER.unpack_from(data)
+        if magic != SAVE_MAGIC or version != SAVE_VERSION:
+            return None
+
+        reader = _Reader(data, HEADER.size)
+        grid = reader.array(np.uint8, rows * columns).reshape(rows, columns)
+        plants = reader.array(PLANT_RECORD, plant_count)
+        trees = reader.array(TREE_RECORD, tree_count)
+        apples = reader.array(APPLE_RECORD, apple_count)
+        plant_types = reader.names()
+        inventories = []
+        for _ in range(2):
+            names = reader.names()
+            counts = reader.array(COUNT_RECORD, len(names)).tolist()
+            inventories.append(dict(zip(names, counts)))
+
+        if plant_count and plants["type"].max() >= len(plant_types):
+            raise ValueError("Unknown plant type")
+        if apple_count and apples["tree"].max() >= tree_count:
+            raise ValueError("Apple on an unknown tree")
+    except (struct.error, ValueError, UnicodeDecodeError):
+        return None
+
+    return GameState(
+        grid=grid,
+        plant_types=plant_types,
+        plants=plants,
+        trees=trees,
+        apples=apples,
+        money=money,
+        position=(player_x, player_y),
+        inventory=inventories[0],
+        seed_inventory=inventories[1],
+        is_raining=is_raining,
+    )
+
+
+def restore(level, state):
+    """
+    Apply a GameState to a freshly loaded level.
+
+    Returns False, leaving the level untouched, when the save does not
+    match the level's map.
+    """
+    soil_layer = level.soil_layer
+    tree_count = len(level.tree_states())
+    if state.grid.shape != soil_layer.grid.shape or len(state.trees) != tree_count:
+        return False
+
+    soil_layer.is_raining = level.is_raining = state.is_raining
+    soil_layer.restore(
+        state.grid,
+        (
+            (x, y, state.plant_types[plant_type], age)
+            for x, y, plant_type, age in state.plants.tolist()
+        ),
+    )
+
+    apples = [[] for _ in range(tree_count)]
+    for tree_index, x, y in state.apples.tolist():
+        apples[tree_index].append((x, y))
+    level.restore_tree_states(
+        [
+            (health, bool(alive), tree_apples)
+            for (health, alive), tree_apples in zip(state.trees.tolist(), apples)
+        ]
+    )
+
+    player = level.player
+    player.money = state.money
+    for inventory, saved in (
+        (player.inventory_items, state.inventory),
+        (player.seed_inventory, state.seed_inventory),
+    ):
+        inventory.update((item, saved[item]) for item in inventory if item in saved)
+    player.hitbox.center = state.position
+    player._update_position()
+    return True
+
+
+def read_save(path):
+    """Return the GameState stored at path, or None if there is none."""
+    try:
+        with open(path, "rb") as file:
+            return decode(file.read())
+    except OSError:
+        return None
+
+
+def write_save(path, state):
+    """Encode and write a GameState, replacing the old save atomically."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(encode(state))
+    os.replace(temporary_path, path)
+
+
+class Autosaver:
+    """Writes snapshots on a background thread, one save at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self.thread = None
+
+    def save(self, level):
+        """Snapshot the level now and write it in the background."""
+        state = snapshot(level)
+        self.wait()
+        self.thread = threading.Thread(
+            target=write_save, args=(self.path, state), daemon=True
+        )
+        self.thread.start()
+
+    def wait(self):
+        """Block until the save in progress, if any, is written."""
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+
+def _pack_names(names):
+    """Pack a sequence of names as a length-prefixed, newline-separated block."""
+    encoded = "\n".join(names).encode()
+    return NAMES_LENGTH.pack(len(encoded)) + encoded
+
+
+class _Reader:
+    """Sequential reader over the sections following the header."""
+
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+
+    def array(self, dtype, count):
+        array = np.frombuffer(self.data, dtype, count, self.offset)
+        self.offset += array.nbytes
+        return array
+
+    def names(self):
+        (length,) = NAMES_LENGTH.unpack_from(self.data, self.offset)
+        self.offset += NAMES_LENGTH.size
+        encoded = self.data[self.offset : self.offset + length]
+        if len(encoded) != length:
+            raise ValueError("Truncated name block")
+        self.offset += length
+        return encoded.decode().split("\n") if encoded else []
@@ -9,6 +9,84 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 TILE_SIZE = 64
 
+# Main loop: with FIXED_TIMESTEP the simulation advances in ticks of
+# 1 / SIMULATION_RATE seconds, separately from rendering. FPS_CAP limits
+# rendered frames (0 for uncapped), MAX_CATCH_UP_TICKS bounds the ticks run
+# for one slow frame and INTERPOLATE_RENDERING draws moving sprites between
+# their last two tick positions.
+FIXED_TIMESTEP = True
+SIMULATION_RATE = 60
+FPS_CAP = 120
+MAX_CATCH_UP_TICKS = 5
+INTERPOLATE_RENDERING = True
+
+# Static layers are baked into chunks of CHUNK_SIZE x CHUNK_SIZE tiles
+STATIC_CHUNKS = True
+CHUNK_SIZE = 8
+
+# Instantiate only the map chunks within STREAM_MARGIN chunks of the view,
+# spending at most STREAM_BUDGET_MS per frame on chunks still off screen
+WORLD_STREAMING = False
+STREAM_MARGIN = 1
+STREAM_BUDGET_MS = 2
+
+# Redraw and update only the changed parts of the screen while the camera
+# and the screen tint stay still, falling back to full frames otherwise
+DIRTY_RECTS = False
+
+# Compiled map cache, rebuilt whenever the TMX or TSX files change
+MAP_PATH = current_dir.parent / "data" / "map.tmx"
+MAP_CACHE_PATH = current_dir.parent / "data" / "map.cache"
+
+# Save file, written after every night and loaded on start (None disables)
+SAVE_PATH = current_dir.parent / "data" / "save.bin"
+
+# Prebuilt image pack (python src/asset_pack.py). Images it lacks or holds
+# out of date are decoded from PNG, those of ASSET_PRELOAD_FOLDERS on
+# ASSET_DECODE_WORKERS threads at startup. Those the game does not use
+# are dropped once the level is built
+ASSET_PACK_PATH = current_dir.parent / "data" / "assets.pack"
+ASSET_PRELOAD_FOLDERS = [
+    current_dir.parent / "graphics" / folder
+    for folder in (
+        "character",
+        "fruit",
+        "objects",
+        "overlay",
+        "rain",
+        "soil",
+        "soil_water",
+        "stumps",
+        "water",
+        "world",
+    )
+]
+ASSET_DECODE_WORKERS = 4
+
+# Maximum number of cached frame sets, None for no limit
+ASSET_FRAME_SET_LIMIT = None
+
+# Frame profiler: F3 toggles the HUD, F4 writes the last
+# PROFILER_TRACE_FRAMES frames to PROFILER_TRACE_PATH as a Chrome trace
+PROFILER_ENABLED = False
+PROFILER_TRACE_FRAMES = 300
+PROFILER_TRACE_PATH = current_dir.parent / "profile_trace.json"
+
+# Sound effects as (file, channel category, volume, maximum simultaneous
+# voices), the mixer channels reserved for each category, and the music
+# streamed in a loop
+SOUND_EFFECTS = {
+    "axe": (current_dir.parent / "audio" / "axe.mp3", "tools", 1.0, 2),
+    "hoe": (current_dir.parent / "audio" / "hoe.wav", "tools", 0.1, 2),
+    "water": (current_dir.parent / "audio" / "water.mp3", "tools", 0.2, 1),
+    "plant": (current_dir.parent / "audio" / "plant.wav", "tools", 0.1, 2),
+    "success": (current_dir.parent / "audio" / "success.wav", "ui", 0.3, 3),
+}
+AUDIO_CHANNELS = {"tools": 4, "ui": 3}
+AUDIO_LOAD_IN_BACKGROUND = True
+MUSIC_PATH = current_dir.parent / "audio" / "bg.mp3"
+MUSIC_VOLUME = 0.3
+
 # Overlay positions
 OVERLAY_POSITIONS = {"tool": (40, SCREEN_HEIGHT - 15), "seed": (70, SCREEN_HEIGHT - 5)}
 
@@ -35,6 +113,9 @@ LAYERS = {
     "rain_drops": 10,
 }
 
+# Spawn rate of each kind of raindrop (floor splashes and falling drops)
+RAIN_DROPS_PER_SECOND = 60
+
 # Apple position data
 APPLE_POSITIONS = {
     "Small": [(18, 17), (30, 37), (12, 50), (30, 45), (20, 30), (30, 10)],
@@ -1,25 +1,23 @@
-import pygame
+import numpy as np
 from pathlib import Path
-from random import randint, choice
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, LAYERS
+from random import getrandbits
+from settings import LAYERS, RAIN_DROPS_PER_SECOND
 from support import import_folder
-from sprites import Generic
+from assets import assets
 
 
 class Sky:
     def __init__(self):
-        self.display_surface = pygame.display.get_surface()
-        self.full_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.start_color = [255, 255, 255]  # White
         self.end_color = (38, 101, 189)  # Sky blue
 
-    def display(self, delta_time):
+    def update(self, delta_time):
         """Blend the sky color from start_color to end_color."""
         self._update_sky_color(delta_time)
-        self.full_surface.fill(self.start_color)
-        self.display_surface.blit(
-            self.full_surface, (0, 0), special_flags=pygame.BLEND_RGB_MULT
-        )
+
+    def tint(self):
+        """Return the color the screen is multiplied by."""
+        return self.start_color
 
     def _update_sky_color(self, delta_time):
         """Update the sky color towards the target end color."""
@@ -28,66 +26,123 @@ class Sky:
                 self.start_color[index] -= 2 * delta_time
 
 
-class RainDrop(Generic):
-    def __init__(self, position, surface, is_moving, groups, layer):
-        super().__init__(position, surface, groups, layer)
-        self.lifetime = randint(400, 500)  # Lifetime in milliseconds
-        self.start_time = pygame.time.get_ticks()  # Set up lifetime
+class RainParticles:
+    """
+    Raindrops of one layer, simulated as a structure of NumPy arrays.
+
+    Drops are spawned at a fixed rate per second, expire together once their
+    lifetime has passed and are drawn as one batch of blits.
+    """
 
-        # Set up movement attributes
+    def __init__(self, frames, area, rate, is_moving):
+        self.frames = frames
+        self.area = area
+        self.rate = rate
         self.is_moving = is_moving
+        # Seeded from the random module so seeding it reproduces the rain
+        self.random = np.random.default_rng(getrandbits(64))
+        self.frame_width = max(frame.get_width() for frame in frames)
+        self.frame_height = max(frame.get_height() for frame in frames)
+
+        self.time = 0.0
+        self.pending_spawns = 0.0
+        self.positions = np.empty((0, 2))
+        self.velocities = np.empty((0, 2))
+        self.birth_times = np.empty(0)
+        self.lifetimes = np.empty(0)
+        self.frame_indices = np.empty(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.birth_times)
+
+    def emit(self, delta_time):
+        """Spawn the drops due for this time step at random map positions."""
+        self.pending_spawns += self.rate * delta_time
+        count = int(self.pending_spawns)
+        if not count:
+            return
+        self.pending_spawns -= count
+
+        width, height = self.area
+        positions = self.random.integers(0, (width + 1, height + 1), (count, 2))
         if self.is_moving:
-            self.position = pygame.math.Vector2(self.rect.topleft)
-            self.direction = pygame.math.Vector2(-2, 4)  # Move left and down
-            self.speed = randint(200, 250)  # Random speed
+            # Move left and down at a random speed
+            speeds = self.random.integers(200, 251, count)[:, None]
+            velocities = np.array([-2.0, 4.0]) * speeds
+        else:
+            velocities = np.zeros((count, 2))
+
+        self.positions = np.concatenate((self.positions, positions))
+        self.velocities = np.concatenate((self.velocities, velocities))
+        self.birth_times = np.concatenate((self.birth_times, np.full(count, self.time)))
+        self.lifetimes = np.concatenate(
+            (self.lifetimes, self.random.integers(400, 501, count) / 1000)
+        )
+        self.frame_indices = np.concatenate(
+            (self.frame_indices, self.random.integers(0, len(self.frames), count))
+        )
 
     def update(self, delta_time):
-        """Update the raindrop's position and check its lifetime."""
+        """Move the drops and remove the ones that outlived their lifetime."""
+        self.time += delta_time
         if self.is_moving:
-            self._move(delta_time)
-        self._check_lifetime()
+            self.positions += self.velocities * delta_time
+
+        alive = self.time - self.birth_times < self.lifetimes
+        if not alive.all():
+            self.positions = self.positions[alive]
+            self.velocities = self.velocities[alive]
+            self.birth_times = self.birth_times[alive]
+            self.lifetimes = self.lifetimes[alive]
+            self.frame_indices = self.frame_indices[alive]
 
-    def _move(self, delta_time):
-        """Move the raindrop based on its speed and direction."""
-        self.position += self.direction * self.speed * delta_time
-        self.rect.topleft = round(self.position.x), round(self.position.y)
+    def visible_blits(self, view_rect, offset_x, offset_y):
+        """Return (surface, screen_position) pairs for the drops in view."""
+        topleft = np.rint(self.positions).astype(int)
+        visible = (
+            (topleft[:, 0] > view_rect.left - self.frame_width)
+            & (topleft[:, 0] < view_rect.right)
+            & (topleft[:, 1] > view_rect.top - self.frame_height)
+            & (topleft[:, 1] < view_rect.bottom)
+        )
+        topleft = topleft[visible]
+        frame_indices = self.frame_indices[visible]
 
-    def _check_lifetime(self):
-        """Check if the raindrop has exceeded its lifetime and kill it."""
-        if pygame.time.get_ticks() - self.start_time >= self.lifetime:
-            self.kill()
+        # Draw in y order, like sprites sharing a layer
+        order = np.argsort(topleft[:, 1], kind="stable")
+        screen_positions = (topleft[order] - (offset_x, offset_y)).tolist()
+        frames = self.frames
+        return [
+            (frames[index], tuple(position))
+            for index, position in zip(frame_indices[order].tolist(), screen_positions)
+        ]
 
 
 class Rain:
     def __init__(self, all_sprites):
-        self.all_sprites = all_sprites
-        self.rain_drops = import_folder(Path("graphics/rain/drops"))
-        self.rain_floor_sprites = import_folder("graphics/rain/floor")
-        self.floor_width, self.floor_height = pygame.image.load(
-            Path("graphics/world/ground.png")
-        ).get_size()
-
-    def create_floor_drop(self):
-        """Create a static floor drop."""
-        RainDrop(
-            position=(randint(0, self.floor_width), randint(0, self.floor_height)),
-            surface=choice(self.rain_floor_sprites),
+        area = assets.image(Path("graphics/world/ground.png")).get_size()
+        self.floor_drops = RainParticles(
+            import_folder("graphics/rain/floor"),
+            area,
+            RAIN_DROPS_PER_SECOND,
             is_moving=False,
-            groups=self.all_sprites,
-            layer=LAYERS["rain_floor"],
         )
-
-    def create_moving_drop(self):
-        """Create a moving raindrop."""
-        RainDrop(
-            position=(randint(0, self.floor_width), randint(0, self.floor_height)),
-            surface=choice(self.rain_drops),
+        self.moving_drops = RainParticles(
+            import_folder(Path("graphics/rain/drops")),
+            area,
+            RAIN_DROPS_PER_SECOND,
             is_moving=True,
-            groups=self.all_sprites,
-            layer=LAYERS["rain_drops"],
+        )
+        all_sprites.add_layer_source(
+            LAYERS["rain_floor"], self.floor_drops.visible_blits
+        )
+        all_sprites.add_layer_source(
+            LAYERS["rain_drops"], self.moving_drops.visible_blits
         )
 
-    def update(self):
-        """Create new drops and update existing ones."""
-        self.create_floor_drop()
-        self.create_moving_drop()
+    def update(self, delta_time, is_raining):
+        """Advance existing drops and spawn new ones while it rains."""
+        for drops in (self.floor_drops, self.moving_drops):
+            if is_raining:
+                drops.emit(delta_time)
+            drops.update(delta_time)
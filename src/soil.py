@@ -1,75 +1,109 @@
+import numpy as np
 import pygame
 from pathlib import Path
 from random import choice
-from pytmx.util_pygame import load_pygame
-from settings import TILE_SIZE, LAYERS, GROWTH_SPEED, current_dir
+from settings import TILE_SIZE, LAYERS, GROWTH_SPEED
 from support import import_folder_dict, import_folder
+from spatial import refresh_spatial
+from audio import audio
+
+# Soil cell flags
+FARMABLE = 1
+TILLED = 2
+WATERED = 4
+PLANTED = 8
+
+# Soil tile names indexed by a mask of tilled neighbors:
+# top = 1, right = 2, bottom = 4, left = 8
+SOIL_TILE_TYPES = (
+    "o", "b", "l", "bl", "t", "tb", "tl", "tbr",
+    "r", "br", "lr", "lrb", "tr", "tbl", "lrt", "x",
+)  # fmt: skip
+
+# Crop types, indexed by the values of SoilLayer.crop_types
+PLANT_TYPES = tuple(GROWTH_SPEED)
 
 
 class SoilTile(pygame.sprite.Sprite):
     """Represents a single soil tile in the game."""
 
+    z = LAYERS["soil"]
+
     def __init__(self, position, surf, groups):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft=position)
-        self.z = LAYERS["soil"]
 
 
 class WaterTile(pygame.sprite.Sprite):
+    z = LAYERS["soil_water"]
+
     def __init__(self, position, surf, groups):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft=position)
-        self.z = LAYERS["soil_water"]
+
+
+def plant_frames(plant_type):
+    """Returns the growth stage images of a crop type."""
+    return import_folder(Path(f"graphics/fruit/{plant_type}"))
 
 
 class Plant(pygame.sprite.Sprite):
-    def __init__(self, plant_type, groups, soil, check_watered):
+    """
+    Displays the crop of one soil cell.
+
+    The crop's age lives in the SoilLayer arrays; the sprite only shows
+    the growth stage it is given.
+    """
+
+    def __init__(self, plant_type, groups, soil):
         super().__init__(groups)
         # Setup
         self.plant_type = plant_type
-        self.frames = import_folder(Path(f"graphics/fruit/{plant_type}"))
+        self.frames = plant_frames(plant_type)
         self.soil = soil
-        self.check_watered = check_watered
 
         # Plant growing
-        self.age = 0
+        self.stage = 0
         self.max_age = len(self.frames) - 1
-        self.grow_speed = GROWTH_SPEED[plant_type]
         self.harvestable = False
 
         # Sprite setup
-        self.image = self.frames[self.age]
+        self.image = self.frames[self.stage]
         self.y_offsett = -16 if plant_type == "corn" else -8
         self.rect = self.image.get_rect(
             midbottom=soil.rect.midbottom + pygame.math.Vector2(0, self.y_offsett)
         )
         self.z = LAYERS["ground_plant"]
 
-    def grow(self):
-        if self.check_watered(self.rect.center):
-            self.age += self.grow_speed
+    def show_stage(self, stage):
+        """
+        Shows a growth stage, updating the layer, hitbox, image and rect.
 
-            if int(self.age) > 0:
-                self.z = LAYERS["main"]
-                self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
+        The hitbox is taken from the previous stage's rect, so it trails
+        the image by one stage.
+        """
+        if stage > 0:
+            self.z = LAYERS["main"]
+            self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
 
-            if self.age >= self.max_age:
-                self.age = self.max_age
-                self.harvestable = True
+        if stage >= self.max_age:
+            stage = self.max_age
+            self.harvestable = True
 
-            self.image = self.frames[int(self.age)]
-            self.rect = self.image.get_rect(
-                midbottom=self.soil.rect.midbottom
-                + pygame.math.Vector2(0, self.y_offsett)
-            )
+        self.stage = stage
+        self.image = self.frames[stage]
+        self.rect = self.image.get_rect(
+            midbottom=self.soil.rect.midbottom + pygame.math.Vector2(0, self.y_offsett)
+        )
+        refresh_spatial(self)
 
 
 class SoilLayer:
     """Manages the soil tiles and their interaction in the game world."""
 
-    def __init__(self, all_sprites, collision_sprites):
+    def __init__(self, all_sprites, collision_sprites, tmx_data):
         # Sprite groups
         self.all_sprites = all_sprites
         self.collision_sprites = collision_sprites
@@ -77,184 +111,286 @@ class SoilLayer:
         self.water_sprites = pygame.sprite.Group()
         self.plant_sprites = pygame.sprite.Group()
 
+        # Sprites by (column, row)
+        self.soil_tiles = {}
+        self.water_tiles = {}
+        self.plants = {}
+
         # Graphics
         self.soil_surfs = import_folder_dict(Path("graphics/soil"))
         self.water_surfs = import_folder(Path("graphics/soil_water"))
 
-        # Create grid and hit rects
-        self.create_soil_grid()
-        self.create_hit_rects()
-
-        # Sounds
-        self.hoe_sound = pygame.mixer.Sound(current_dir.parent / Path("audio/hoe.wav"))
-        self.hoe_sound.set_volume(0.1)
+        # Create grid
+        self.create_soil_grid(tmx_data)
 
-        self.plant_sound = pygame.mixer.Sound(
-            current_dir.parent / Path("audio/plant.wav")
+        # Growth speed and final stage of each crop type
+        self.growth_speeds = np.array(
+            [GROWTH_SPEED[plant_type] for plant_type in PLANT_TYPES], dtype=np.float32
+        )
+        self.max_ages = np.array(
+            [len(plant_frames(plant_type)) - 1 for plant_type in PLANT_TYPES],
+            dtype=np.float32,
         )
-        self.plant_sound.set_volume(0.1)
 
-    def create_soil_grid(self):
+    def create_soil_grid(self, tmx_data):
         """
         Creates a grid based on the 'Farmable' layer from the map,
         marking farmable spots.
-        """
-        ground_image = pygame.image.load(Path("graphics/world/ground.png"))
-        h_tiles = ground_image.get_width() // TILE_SIZE
-        v_tiles = ground_image.get_height() // TILE_SIZE
-
-        self.grid = [[[] for _ in range(h_tiles)] for _ in range(v_tiles)]
-
-        farmable_layer = load_pygame(Path("data/map.tmx")).get_layer_by_name("Farmable")
-        for x, y, _ in farmable_layer.tiles():
-            self.grid[y][x].append("F")
 
-    def create_hit_rects(self):
-        """Creates hit rectangles for all farmable tiles."""
-        self.hit_rects = [
-            pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            for y, row in enumerate(self.grid)
-            for x, cell in enumerate(row)
-            if "F" in cell
-        ]
+        Each cell is a bitmask of FARMABLE, TILLED, WATERED and PLANTED.
+        Planted cells also have a crop type (an index into PLANT_TYPES), an
+        age and the growth stage their sprite currently shows.
+        """
+        shape = (tmx_data.height, tmx_data.width)
+        self.grid = np.zeros(shape, dtype=np.uint8)
+        self.crop_types = np.zeros(shape, dtype=np.uint8)
+        self.crop_ages = np.zeros(shape, dtype=np.float32)
+        self.crop_stages = np.zeros(shape, dtype=np.uint8)
+
+        for x, y, _ in tmx_data.layer_tiles("Farmable"):
+            self.grid[y, x] |= FARMABLE
+
+    def count_tiles(self, flag):
+        """Returns the number of cells that have all bits of flag set."""
+        return int(np.count_nonzero(self.grid & flag == flag))
+
+    def cell_at(self, position):
+        """Returns the (column, row) under a pixel position, or None off the map."""
+        x = int(position[0]) // TILE_SIZE
+        y = int(position[1]) // TILE_SIZE
+        rows, columns = self.grid.shape
+        if 0 <= x < columns and 0 <= y < rows:
+            return x, y
+        return None
 
     def get_hit(self, point):
         """Registers a hit on the soil at the specified point."""
-        for rect in self.hit_rects:
-            if rect.collidepoint(point):
-                self.hoe_sound.play()
+        cell = self.cell_at(point)
+        if cell is None:
+            return
+
+        x, y = cell
+        if self.grid[y, x] & FARMABLE:
+            audio.play("hoe")
 
-                x = rect.x // TILE_SIZE
-                y = rect.y // TILE_SIZE
-                if "F" in self.grid[y][x]:
-                    self.grid[y][x].append("X")
-                    self.create_soil_tiles()
+            if not self.grid[y, x] & TILLED:
+                self.grid[y, x] |= TILLED
+                self.update_soil_tiles(x, y)
 
-                    if self.is_raining:
-                        self.water_all()
+                if self.is_raining:
+                    self.water_tile(x, y)
 
     def water(self, target_position):
-        for soil_sprite in self.soil_sprites.sprites():
-            if soil_sprite.rect.collidepoint(target_position):
-                x = soil_sprite.rect.x // TILE_SIZE
-                y = soil_sprite.rect.y // TILE_SIZE
-                self.grid[y][x].append("W")
-
-                WaterTile(
-                    position=soil_sprite.rect.topleft,
-                    surf=choice(self.water_surfs),
-                    groups=[self.all_sprites, self.water_sprites],
-                )
+        cell = self.cell_at(target_position)
+        if cell in self.soil_tiles:
+            self.water_tile(*cell)
+
+    def water_tile(self, x, y):
+        """Waters the tilled cell at column x, row y if it is still dry."""
+        if self.grid[y, x] & (TILLED | WATERED) == TILLED:
+            self.grid[y, x] |= WATERED
+            self._place_water_tile(x, y)
 
     def water_all(self):
-        for index_row, row in enumerate(self.grid):
-            for index_column, cell in enumerate(row):
-                if "X" in cell and "W" not in cell:
-                    cell.append("W")
-                    WaterTile(
-                        position=(index_column * TILE_SIZE, index_row * TILE_SIZE),
-                        surf=choice(self.water_surfs),
-                        groups=[self.all_sprites, self.water_sprites],
-                    )
+        dry_tilled = self.grid & (TILLED | WATERED) == TILLED
+        self.grid[dry_tilled] |= WATERED
+
+        rows, columns = np.nonzero(dry_tilled)
+        for y, x in zip(rows.tolist(), columns.tolist()):
+            self._place_water_tile(x, y)
+
+    def _place_water_tile(self, x, y):
+        """Creates the water overlay sprite for a cell."""
+        self.water_tiles[(x, y)] = WaterTile(
+            position=(x * TILE_SIZE, y * TILE_SIZE),
+            surf=choice(self.water_surfs),
+            groups=[self.all_sprites, self.water_sprites],
+        )
 
     def remove_water(self):
-        for sprite in self.water_sprites.sprites():
+        for sprite in self.water_tiles.values():
             sprite.kill()
+        self.water_tiles.clear()
+
+        self.grid &= ~np.uint8(WATERED)
 
-        for row in self.grid:
-            for cell in row:
-                if "W" in cell:
-                    cell.remove("W")
+    def sync_water(self):
+        """Rebuilds the water sprites from the grid's WATERED cells."""
+        for sprite in self.water_tiles.values():
+            sprite.kill()
+        self.water_tiles.clear()
 
-    def check_watered(self, position):
-        x = position[0] // TILE_SIZE
-        y = position[1] // TILE_SIZE
-        cell = self.grid[y][x]
-        is_watered = "W" in cell
-        return is_watered
+        rows, columns = np.nonzero(self.grid & WATERED)
+        for y, x in zip(rows.tolist(), columns.tolist()):
+            self._place_water_tile(x, y)
 
     def plant_seed(self, target_position, seed):
-        for soil_sprite in self.soil_sprites.sprites():
-            if soil_sprite.rect.collidepoint(target_position):
-                self.plant_sound.play()
-
-                x = soil_sprite.rect.x // TILE_SIZE
-                y = soil_sprite.rect.y // TILE_SIZE
-
-                if "P" not in self.grid[y][x]:
-                    self.grid[y][x].append("P")
-                    Plant(
-                        plant_type=seed,
-                        groups=[
-                            self.all_sprites,
-                            self.plant_sprites,
-                            self.collision_sprites,
-                        ],
-                        soil=soil_sprite,
-                        check_watered=self.check_watered,
-                    )
+        cell = self.cell_at(target_position)
+        soil_sprite = self.soil_tiles.get(cell)
+        if soil_sprite:
+            audio.play("plant")
+
+            x, y = cell
+            if not self.grid[y, x] & PLANTED:
+                self.grid[y, x] |= PLANTED
+                self._place_plant(x, y, seed, 0)
+
+    def _place_plant(self, x, y, plant_type, age):
+        """Records a crop in the arrays and creates its sprite at stage 0."""
+        self.crop_types[y, x] = PLANT_TYPES.index(plant_type)
+        self.crop_ages[y, x] = age
+        self.crop_stages[y, x] = 0
+        self.plants[(x, y)] = Plant(
+            plant_type=plant_type,
+            groups=[
+                self.all_sprites,
+                self.plant_sprites,
+                self.collision_sprites,
+            ],
+            soil=self.soil_tiles[(x, y)],
+        )
+
+    def plants_colliding(self, rect):
+        """
+        Returns the plants whose rect overlaps rect.
+
+        Plants are drawn up to a few pixels above their own cell, so the row
+        below rect is checked as well.
+        """
+        plants = []
+        for y in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 2):
+            for x in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+                plant = self.plants.get((x, y))
+                if plant and plant.rect.colliderect(rect):
+                    plants.append(plant)
+        return plants
+
+    def remove_plant(self, plant):
+        """Kills a plant and frees the cell it was planted in."""
+        x = plant.soil.rect.x // TILE_SIZE
+        y = plant.soil.rect.y // TILE_SIZE
+        plant.kill()
+        del self.plants[(x, y)]
+        self.grid[y, x] &= ~np.uint8(PLANTED)
 
     def update_plants(self):
-        for plant in self.plant_sprites.sprites():
-            plant.grow()
+        """Grows the watered crops by one day and updates their sprites."""
+        self.grow_crops()
+        self.sync_plants()
+
+    def grow_crops(self):
+        """Advances the age of every watered crop by one day."""
+        growing = self.grid & (PLANTED | WATERED) == PLANTED | WATERED
+        np.minimum(
+            self.crop_ages + self.growth_speeds[self.crop_types],
+            self.max_ages[self.crop_types],
+            out=self.crop_ages,
+            where=growing,
+        )
+
+    def sync_plants(self):
+        """Updates the plant sprites whose growth stage changed."""
+        stages = self.crop_ages.astype(np.uint8)
+        changed = (self.grid & PLANTED > 0) & (stages != self.crop_stages)
+        self.crop_stages[changed] = stages[changed]
+
+        rows, columns = np.nonzero(changed)
+        for y, x in zip(rows.tolist(), columns.tolist()):
+            self.plants[(x, y)].show_stage(int(stages[y, x]))
+
+    def simulate_days(self, rainy_days):
+        """
+        Runs one night per entry of rainy_days, which is True where rain
+        waters the following day.
+
+        Nights only change the grid and crop arrays. Sprites are brought up
+        to date once at the end, so long runs cost no rendering work.
+        """
+        tilled = self.grid & TILLED > 0
+        for is_raining in rainy_days:
+            self.grow_crops()
+            self.grid &= ~np.uint8(WATERED)
+            if is_raining:
+                self.grid[tilled] |= WATERED
+        self.sync_plants()
+        self.sync_water()
+
+    def restore(self, grid, plants):
+        """
+        Replaces the whole soil state with a saved one.
+
+        grid is a soil grid of the same shape and plants an iterable of
+        (x, y, plant type, age) for every planted cell.
+        """
+        for sprite in [*self.soil_tiles.values(), *self.plants.values()]:
+            sprite.kill()
+        self.plants.clear()
+        self.remove_water()
+
+        self.grid = grid.copy()
+        self.crop_types.fill(0)
+        self.crop_ages.fill(0)
+        self.crop_stages.fill(0)
+        self.create_soil_tiles()
+
+        rows, columns = np.nonzero(self.grid & WATERED)
+        for y, x in zip(rows.tolist(), columns.tolist()):
+            self._place_water_tile(x, y)
+
+        # Each sprite first shows the stage before its current one, so its
+        # hitbox trails the image as it would have after growing
+        self.grid &= ~np.uint8(PLANTED)
+        for x, y, plant_type, age in plants:
+            if (x, y) in self.soil_tiles and plant_type in GROWTH_SPEED:
+                self.grid[y, x] |= PLANTED
+                self._place_plant(x, y, plant_type, age)
+                previous_stage = int(max(age - GROWTH_SPEED[plant_type], 0))
+                if previous_stage:
+                    self.plants[(x, y)].show_stage(previous_stage)
+                    self.crop_stages[y, x] = previous_stage
+        self.sync_plants()
 
     def create_soil_tiles(self):
-        """Creates and updates soil tiles based on the grid's state."""
-        self.soil_sprites.empty()
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if "X" in cell:
-                    tile_type = self.determine_tile_type(x, y)
-                    SoilTile(
-                        position=(x * TILE_SIZE, y * TILE_SIZE),
-                        surf=self.soil_surfs[tile_type],
-                        groups=[self.all_sprites, self.soil_sprites],
-                    )
+        """Rebuilds every soil tile from the grid's state."""
+        for tile in self.soil_tiles.values():
+            tile.kill()
+        self.soil_tiles.clear()
+
+        rows, columns = np.nonzero(self.grid & TILLED)
+        for y, x in zip(rows.tolist(), columns.tolist()):
+            self._place_soil_tile(x, y)
+
+    def update_soil_tiles(self, x, y):
+        """Updates the soil tile at column x, row y and its four neighbors."""
+        rows, columns = self.grid.shape
+        for cell_x, cell_y in ((x, y), (x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+            if 0 <= cell_x < columns and 0 <= cell_y < rows:
+                if self.grid[cell_y, cell_x] & TILLED:
+                    self._place_soil_tile(cell_x, cell_y)
+
+    def _place_soil_tile(self, x, y):
+        """Creates the soil tile for a cell or swaps the image of the existing one."""
+        surf = self.soil_surfs[self.determine_tile_type(x, y)]
+        tile = self.soil_tiles.get((x, y))
+        if tile:
+            tile.image = surf
+        else:
+            self.soil_tiles[(x, y)] = SoilTile(
+                position=(x * TILE_SIZE, y * TILE_SIZE),
+                surf=surf,
+                groups=[self.all_sprites, self.soil_sprites],
+            )
 
     def determine_tile_type(self, x, y):
         """Determines the type of tile to render based on its neighbors."""
-        top = "X" in self.grid[y - 1][x] if y > 0 else False
-        bottom = "X" in self.grid[y + 1][x] if y < len(self.grid) - 1 else False
-        left = "X" in self.grid[y][x - 1] if x > 0 else False
-        right = "X" in self.grid[y][x + 1] if x < len(self.grid[y]) - 1 else False
-
-        # Default tile type
-        tile_type = "o"
-
-        # All sides
-        if top and bottom and left and right:
-            tile_type = "x"
-        # Horizontal tiles
-        elif left and not top and not bottom and not right:
-            tile_type = "r"
-        elif right and not top and not bottom and not left:
-            tile_type = "l"
-        elif right and left and not top and not bottom:
-            tile_type = "lr"
-        # Vertical tiles
-        elif top and not right and not left and not bottom:
-            tile_type = "b"
-        elif bottom and not right and not left and not top:
-            tile_type = "t"
-        elif top and bottom and not right and not left:
-            tile_type = "tb"
-        # Corners
-        elif left and bottom and not top and not right:
-            tile_type = "tr"
-        elif right and bottom and not top and not left:
-            tile_type = "tl"
-        elif left and top and not bottom and not right:
-            tile_type = "br"
-        elif right and top and not bottom and not left:
-            tile_type = "bl"
-        # T shapes
-        elif top and bottom and right and not left:
-            tile_type = "tbr"
-        elif top and bottom and left and not right:
-            tile_type = "tbl"
-        elif left and right and top and not bottom:
-            tile_type = "lrb"
-        elif left and right and bottom and not top:
-            tile_type = "lrt"
-
-        return tile_type
+        rows, columns = self.grid.shape
+        mask = 0
+        if y > 0 and self.grid[y - 1, x] & TILLED:
+            mask |= 1
+        if x < columns - 1 and self.grid[y, x + 1] & TILLED:
+            mask |= 2
+        if y < rows - 1 and self.grid[y + 1, x] & TILLED:
+            mask |= 4
+        if x > 0 and self.grid[y, x - 1] & TILLED:
+            mask |= 8
+        return SOIL_TILE_TYPES[mask]
@@ -0,0 +1,166 @@
+import pygame
+from itertools import count
+from settings import TILE_SIZE
+
+
+def refresh_spatial(sprite):
+    """Re-index a sprite in every spatial group after its rects changed."""
+    for group in sprite.groups():
+        if isinstance(group, SpatialHashGroup):
+            group.refresh(sprite)
+
+
+class SpatialHashGroup(pygame.sprite.Group):
+    """
+    Sprite group indexed by a uniform grid of buckets.
+
+    Sprites are bucketed by the rect named by rect_attribute. New sprites are
+    indexed lazily on the next query, since sprites join their groups before
+    their rects are assigned. Sprites without that rect are not indexed.
+    """
+
+    def __init__(self, cell_size=TILE_SIZE * 2, rect_attribute="rect"):
+        super().__init__()
+        self.cell_size = cell_size
+        self.rect_attribute = rect_attribute
+        self.cells = {}
+        self.sprite_cells = {}
+        self.sprite_order = {}
+        self.order_counter = count()
+        self.incoming = set()
+
+    def add_internal(self, sprite, layer=None):
+        """Queue the sprite for indexing on the next query."""
+        super().add_internal(sprite, layer)
+        self.sprite_order[sprite] = next(self.order_counter)
+        self.incoming.add(sprite)
+
+    def remove_internal(self, sprite):
+        """Remove the sprite from the index."""
+        super().remove_internal(sprite)
+        del self.sprite_order[sprite]
+        self.incoming.discard(sprite)
+        self._unindex(sprite)
+
+    def refresh(self, sprite):
+        """Re-index a sprite whose rect has moved or changed size."""
+        if sprite in self.sprite_order and sprite not in self.incoming:
+            self._unindex(sprite)
+            self._index(sprite)
+
+    def query_rect(self, rect):
+        """Return the sprites whose rect overlaps rect, in insertion order."""
+        return [
+            sprite
+            for sprite in self._candidates(rect)
+            if getattr(sprite, self.rect_attribute).colliderect(rect)
+        ]
+
+    def query_point(self, point):
+        """Return the sprites whose rect contains point, in insertion order."""
+        self._flush()
+        cell = self.cells.get(self._cell_of(point), {})
+        return sorted(
+            (
+                sprite
+                for sprite in cell
+                if getattr(sprite, self.rect_attribute).collidepoint(point)
+            ),
+            key=self.sprite_order.__getitem__,
+        )
+
+    def _candidates(self, rect):
+        """Return the sprites sharing a bucket with rect, in insertion order."""
+        self._flush()
+        found = {}
+        for key in self._cells_touching(rect):
+            cell = self.cells.get(key)
+            if cell:
+                found.update(cell)
+        return sorted(found, key=self.sprite_order.__getitem__)
+
+    def _flush(self):
+        """Index the sprites added since the last query."""
+        for sprite in self.incoming:
+            self._index(sprite)
+        self.incoming.clear()
+
+    def _index(self, sprite):
+        """Insert a sprite into every bucket its rect overlaps."""
+        rect = getattr(sprite, self.rect_attribute, None)
+        keys = tuple(self._cells_touching(rect)) if rect is not None else ()
+        for key in keys:
+            self.cells.setdefault(key, {})[sprite] = None
+        self.sprite_cells[sprite] = keys
+
+    def _unindex(self, sprite):
+        """Remove a sprite from the buckets it was inserted into."""
+        for key in self.sprite_cells.pop(sprite, ()):
+            cell = self.cells[key]
+            del cell[sprite]
+            if not cell:
+                del self.cells[key]
+
+    def _cell_of(self, point):
+        """Return the bucket holding a point."""
+        return int(point[0]) // self.cell_size, int(point[1]) // self.cell_size
+
+    def _cells_touching(self, rect):
+        """Yield the buckets overlapped by rect."""
+        for cell_y in range(
+            rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1
+        ):
+            for cell_x in range(
+                rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1
+            ):
+                yield cell_x, cell_y
+
+
+class CollisionGroup(SpatialHashGroup):
+    """
+    Colliders indexed by hitbox, plus a per-tile bitmap for static tiles.
+
+    Static tiles never move, so they are stored as one byte per map tile
+    instead of sprites. Their hitbox matches what an Obstacle tile would get.
+    """
+
+    def __init__(self, cell_size=TILE_SIZE * 2):
+        super().__init__(cell_size, rect_attribute="hitbox")
+        self.static_width = 0
+        self.static_height = 0
+        self.static_tiles = bytearray()
+        self.static_hitbox = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE).inflate(
+            -TILE_SIZE * 0.2, -TILE_SIZE * 0.75
+        )
+
+    def create_static_grid(self, width, height):
+        """Allocate an empty bitmap of width x height tiles."""
+        self.static_width = width
+        self.static_height = height
+        self.static_tiles = bytearray(width * height)
+
+    def add_static_tile(self, x, y):
+        """Mark the tile at column x, row y as solid."""
+        self.static_tiles[y * self.static_width + x] = 1
+
+    def hitboxes_near(self, rect):
+        """
+        Return the hitboxes of colliders sharing a bucket or tile with rect.
+
+        Candidates are not filtered, so callers that move rect while resolving
+        collisions can test each one against its current position.
+        """
+        hitboxes = [sprite.hitbox for sprite in self._candidates(rect)]
+
+        left = max(rect.left // TILE_SIZE, 0)
+        right = min((rect.right - 1) // TILE_SIZE, self.static_width - 1)
+        top = max(rect.top // TILE_SIZE, 0)
+        bottom = min((rect.bottom - 1) // TILE_SIZE, self.static_height - 1)
+        for y in range(top, bottom + 1):
+            row = y * self.static_width
+            for x in range(left, right + 1):
+                if self.static_tiles[row + x]:
+                    hitboxes.append(
+                        self.static_hitbox.move(x * TILE_SIZE, y * TILE_SIZE)
+                    )
+        return hitboxes
@@ -1,7 +1,9 @@
 import pygame
 from settings import *
-from pathlib import Path
 from random import randint, choice
+from spatial import refresh_spatial
+from assets import assets
+from audio import audio
 
 
 class Generic(pygame.sprite.Sprite):
@@ -12,41 +14,30 @@ class Generic(pygame.sprite.Sprite):
         self.image = surf
         self.rect = self.image.get_rect(topleft=position)
         self.z = LAYERS["main"] if z is None else z
+
+
+class Obstacle(Generic):
+    """Static sprite the player collides with through its hitbox."""
+
+    def __init__(self, position, surf, groups, z=None):
+        super().__init__(position, surf, groups, z)
         self.hitbox = self.rect.copy().inflate(
             -self.rect.width * 0.2, -self.rect.height * 0.75
         )
 
 
-class Interaction(Generic):
+class Interaction(pygame.sprite.Sprite):
+    """Invisible named area the player can interact with."""
+
     def __init__(self, position, size, groups, name):
-        surf = pygame.Surface(size)
-        super().__init__(position, surf, groups)
+        super().__init__(groups)
+        # Assigned separately so the position is rounded like get_rect() does
+        self.rect = pygame.Rect((0, 0), size)
+        self.rect.topleft = position
         self.name = name
 
 
-class Water(Generic):
-    """Water sprite class for animated water."""
-
-    def __init__(self, position, frames, groups):
-        self.frames = frames
-        self.frame_index = 0
-        super().__init__(
-            position, self.frames[self.frame_index], groups, LAYERS["water"]
-        )
-
-    def animate(self, delta_time):
-        """Animate the water frames based on time."""
-        self.frame_index += 5 * delta_time
-        if self.frame_index >= len(self.frames):
-            self.frame_index = 0
-        self.image = self.frames[int(self.frame_index)]
-
-    def update(self, delta_time):
-        """Update the water animation."""
-        self.animate(delta_time)
-
-
-class WildFlower(Generic):
+class WildFlower(Obstacle):
     """Wildflower sprite class."""
 
     def __init__(self, position, surf, groups):
@@ -55,92 +46,135 @@ class WildFlower(Generic):
 
 
 class Particle(Generic):
-    def __init__(self, position, surf, groups, z, duration=200):
-        super().__init__(position, surf, groups, z)
-        self.start_time = pygame.time.get_ticks()
-        self.duration = duration
+    """White flash of a surface, removed after duration simulation milliseconds."""
 
-        # White surface
-        mask_surf = pygame.mask.from_surface(self.image)
-        new_surf = mask_surf.to_surface()
-        new_surf.set_colorkey((0, 0, 0))
-        self.image = new_surf
-
-    def update(self, delta_time):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.start_time > self.duration:
-            self.kill()
+    def __init__(self, position, surf, groups, z, scheduler, duration=200):
+        super().__init__(position, assets.silhouette(surf), groups, z)
+        scheduler.call_later(duration, self.kill)
 
 
-class Tree(Generic):
+class Tree(Obstacle):
     """Tree sprite class."""
 
-    def __init__(self, position, surf, groups, name, add_item):
+    max_health = 5
+
+    def __init__(self, position, surf, groups, name, add_item, scheduler):
         super().__init__(position, surf, groups)
 
+        # Apples and particles go to the first group given, the camera group.
+        # Sprite.groups() has no stable order, so it is kept here.
+        self.all_sprites = groups[0]
+
         # Tree attributes
-        self.health = 5
+        self.name = name
+        self.health = self.max_health
         self.alive = True
-        self.stump_surf = pygame.image.load(
+        self.stump_surf = assets.image(
             current_dir.parent / "graphics" / "stumps" / f"{name.lower()}.png"
-        ).convert_alpha()
-        self.apple_surf = pygame.image.load(
+        )
+        self.apple_surf = assets.image(
             current_dir.parent / "graphics" / "fruit" / "apple.png"
         )
-        self.apple_position = APPLE_POSITIONS[name]
         self.apple_sprites = pygame.sprite.Group()
         self.create_fruit()
 
         self.add_item = add_item
-
-        # Sounds
-        self.axe_sound = pygame.mixer.Sound(current_dir.parent / Path("audio/axe.mp3"))
+        self.scheduler = scheduler
 
     def damage(self):
         self.health -= 1
 
         # Play sound
-        self.axe_sound.play()
+        audio.play("axe")
 
-        if len(self.apple_sprites.sprites()) > 0:
-            random_apple = choice(self.apple_sprites.sprites())
+        apples = self.apple_sprites.sprites()
+        if apples:
+            random_apple = choice(apples)
             Particle(
                 position=random_apple.rect.topleft,
                 surf=random_apple.image,
-                groups=self.groups()[0],
+                groups=self.all_sprites,
                 z=LAYERS["fruit"],
+                scheduler=self.scheduler,
             )
             self.add_item("apple")
             random_apple.kill()
 
+    @staticmethod
+    def roll_apples(name):
+        """Return the offsets of the apples grown overnight on a tree."""
+        return [position for position in APPLE_POSITIONS[name] if randint(0, 10) < 2]
+
+    @classmethod
+    def initial_state(cls, name):
+        """Return the state of a tree that was never cut, as for restore()."""
+        return cls.max_health, True, cls.roll_apples(name)
+
     def create_fruit(self):
-        for position in self.apple_position:
-            if randint(0, 10) < 2:
-                Generic(
-                    position=(
-                        position[0] + self.rect.left,
-                        position[1] + self.rect.top,
-                    ),
-                    surf=self.apple_surf,
-                    groups=[self.apple_sprites, self.groups()[0]],
-                    z=LAYERS["fruit"],
-                )
+        for position in self.roll_apples(self.name):
+            self._create_apple(position)
+
+    def _create_apple(self, offset):
+        """Hang an apple at an offset from the tree's top left corner."""
+        Generic(
+            position=(
+                offset[0] + self.rect.left,
+                offset[1] + self.rect.top,
+            ),
+            surf=self.apple_surf,
+            groups=[self.apple_sprites, self.all_sprites],
+            z=LAYERS["fruit"],
+        )
+
+    def apple_offsets(self):
+        """Return the offset of each apple from the tree's top left corner."""
+        return [
+            (apple.rect.left - self.rect.left, apple.rect.top - self.rect.top)
+            for apple in self.apple_sprites
+        ]
+
+    def get_state(self):
+        """Return the health, stump state and apples, as for restore()."""
+        return max(self.health, 0), self.alive, self.apple_offsets()
+
+    def restore(self, health, alive, apple_offsets):
+        """Apply saved health, stump state and apples."""
+        self.health = health
+        if self.alive and not alive:
+            self._become_stump()
+
+        for apple in self.apple_sprites.sprites():
+            apple.kill()
+        for offset in apple_offsets:
+            self._create_apple(offset)
 
     def check_death(self):
         if self.health <= 0:
             Particle(
                 position=self.rect.topleft,
                 surf=self.image,
-                groups=self.groups()[0],
+                groups=self.all_sprites,
                 z=LAYERS["fruit"],
+                scheduler=self.scheduler,
                 duration=300,
             )
-            self.image = self.stump_surf
-            self.rect = self.image.get_rect(midbottom=self.rect.midbottom)
-            self.hitbox = self.rect.copy().inflate(-10, -self.rect.height * 0.6)
-            self.alive = False
+            self._become_stump()
             self.add_item("wood")
 
+    def kill(self):
+        """Remove the tree along with its apples."""
+        for apple in self.apple_sprites.sprites():
+            apple.kill()
+        super().kill()
+
+    def _become_stump(self):
+        """Swap the tree for its stump."""
+        self.image = self.stump_surf
+        self.rect = self.image.get_rect(midbottom=self.rect.midbottom)
+        self.hitbox = self.rect.copy().inflate(-10, -self.rect.height * 0.6)
+        refresh_spatial(self)
+        self.alive = False
+
     def update(self, delta_time):
         if self.alive:
             self.check_death()
@@ -0,0 +1,176 @@
+import pygame
+from collections import defaultdict, namedtuple
+from time import perf_counter
+from settings import CHUNK_SIZE, TILE_SIZE, STREAM_MARGIN, STREAM_BUDGET_MS
+
+# A map object that can be instantiated on demand
+Record = namedtuple("Record", "kind position args")
+
+
+class WorldStreamer:
+    """
+    Keeps only the map chunks around the camera instantiated.
+
+    Map objects are registered as records in the chunk holding their
+    position. Chunks within margin chunks of the view are loaded by calling
+    spawn(kind, position, *args), and chunks beyond margin + 1 are unloaded
+    again, so walking along a chunk border does not thrash. Sprites with a
+    get_state() method are reduced to that state when unloaded and get it
+    back through restore(*state) when loaded again.
+
+    Chunks overlapping the view are loaded at once. The others are loaded
+    nearest first, while the frame's budget_ms lasts.
+    """
+
+    def __init__(
+        self,
+        spawn,
+        static_chunks=None,
+        initial_states=None,
+        chunk_size=CHUNK_SIZE * TILE_SIZE,
+        margin=STREAM_MARGIN,
+        budget_ms=STREAM_BUDGET_MS,
+    ):
+        self.spawn = spawn
+        self.static_chunks = static_chunks
+        self.initial_states = initial_states or {}
+        self.chunk_size = chunk_size
+        self.margin = margin
+        self.budget_ms = budget_ms
+        self.records = []
+        self.chunk_records = defaultdict(list)
+        self.kind_records = defaultdict(list)
+        self.states = {}
+        self.loaded = {}
+
+    def add(self, kind, position, args):
+        """Register a map object, returning its record id."""
+        record_id = len(self.records)
+        self.records.append(Record(kind, position, args))
+        self.chunk_records[self._chunk_of(position)].append(record_id)
+        self.kind_records[kind].append(record_id)
+        if kind in self.initial_states:
+            self.states[record_id] = self.initial_states[kind](*args)
+        return record_id
+
+    def update(self, view_rect, immediate=False):
+        """
+        Load and unload chunks for a view rect in world coordinates.
+
+        With immediate, every chunk within the margin is loaded regardless
+        of the budget.
+        """
+        keep_rect = self._inflate(view_rect, self.margin + 1)
+        distant = [
+            chunk
+            for chunk in self.loaded
+            if not keep_rect.colliderect(self._chunk_rect(chunk))
+        ]
+        for chunk in distant:
+            self.unload_chunk(chunk)
+
+        # Objects are anchored by their top left corner, so the chunks just
+        # above and left of the view can hold visible objects.
+        for chunk in self._chunks_touching(self._inflate(view_rect, 0.5)):
+            if chunk not in self.loaded:
+                self.load_chunk(chunk)
+
+        center_x, center_y = self._chunk_of(view_rect.center)
+        pending = sorted(
+            (
+                chunk
+                for chunk in self._chunks_touching(
+                    self._inflate(view_rect, self.margin)
+                )
+                if chunk not in self.loaded
+            ),
+            key=lambda chunk: (chunk[0] - center_x) ** 2 + (chunk[1] - center_y) ** 2,
+        )
+        deadline = perf_counter() + self.budget_ms / 1000
+        for chunk in pending:
+            if not immediate and perf_counter() > deadline:
+                break
+            self.load_chunk(chunk)
+
+    def load_chunk(self, chunk):
+        """Instantiate the objects and bake the static tiles of a chunk."""
+        sprites = []
+        for record_id in self.chunk_records.get(chunk, ()):
+            kind, position, args = self.records[record_id]
+            sprite = self.spawn(kind, position, *args)
+            if record_id in self.states:
+                sprite.restore(*self.states.pop(record_id))
+            sprites.append((record_id, sprite))
+        self.loaded[chunk] = sprites
+        if self.static_chunks:
+            self.static_chunks.bake_chunk(*chunk)
+
+    def unload_chunk(self, chunk):
+        """Kill the sprites of a chunk, keeping the state of stateful ones."""
+        for record_id, sprite in self.loaded.pop(chunk):
+            if hasattr(sprite, "get_state"):
+                self.states[record_id] = sprite.get_state()
+            sprite.kill()
+        if self.static_chunks:
+            self.static_chunks.drop_chunk(*chunk)
+
+    def record_states(self, kind):
+        """Return the state of every object of a kind, in registration order."""
+        live = self._live_sprites()
+        return [
+            live[record_id].get_state() if record_id in live else self.states[record_id]
+            for record_id in self.kind_records[kind]
+        ]
+
+    def restore_states(self, kind, states):
+        """Apply states to the objects of a kind, in registration order."""
+        live = self._live_sprites()
+        for record_id, state in zip(self.kind_records[kind], states):
+            if record_id in live:
+                live[record_id].restore(*state)
+            else:
+                self.states[record_id] = state
+
+    def update_stored_states(self, kind, function):
+        """Replace each stored state of a kind by function(record, state)."""
+        for record_id in self.kind_records[kind]:
+            if record_id in self.states:
+                self.states[record_id] = function(
+                    self.records[record_id], self.states[record_id]
+                )
+
+    def _live_sprites(self):
+        """Return the loaded sprites by record id."""
+        return {
+            record_id: sprite
+            for sprites in self.loaded.values()
+            for record_id, sprite in sprites
+        }
+
+    def _inflate(self, rect, chunks):
+        """Return rect grown by a number of chunks on every side."""
+        size = int(chunks * self.chunk_size)
+        return rect.inflate(size * 2, size * 2)
+
+    def _chunk_of(self, point):
+        """Return the chunk holding a point."""
+        return int(point[0]) // self.chunk_size, int(point[1]) // self.chunk_size
+
+    def _chunk_rect(self, chunk):
+        """Return the world rect covered by a chunk."""
+        return pygame.Rect(
+            chunk[0] * self.chunk_size,
+            chunk[1] * self.chunk_size,
+            self.chunk_size,
+            self.chunk_size,
+        )
+
+    def _chunks_touching(self, rect):
+        """Yield the chunks overlapped by rect."""
+        for chunk_y in range(
+            rect.top // self.chunk_size, (rect.bottom - 1) // self.chunk_size + 1
+        ):
+            for chunk_x in range(
+                rect.left // self.chunk_size, (rect.right - 1) // self.chunk_size + 1
+            ):
+                yield chunk_x, chunk_y
@@ -0,0 +1,208 @@
+import marshal
+import pygame
+import xml.etree.ElementTree as ElementTree
+from array import array
+from collections import namedtuple
+from itertools import product
+from pathlib import Path
+from pytmx.util_pygame import load_pygame
+from assets import assets
+
+MAP_CACHE_VERSION = 1
+
+MapObject = namedtuple("MapObject", "name x y width height image")
+
+
+class TileMap:
+    """
+    Tile layers, object layers and tile images of a Tiled map.
+
+    Layers hold tile ids only. Each id refers to a rect of a tileset image
+    (or a whole image for collection tilesets), which is cut out on first use
+    from the shared asset cache.
+    """
+
+    def __init__(self, path, data):
+        self.directory = Path(path).parent
+        self.width = data["width"]
+        self.height = data["height"]
+        self.tile_width = data["tile_width"]
+        self.tile_height = data["tile_height"]
+        self.layers = {name: array("I", gids) for name, gids in data["layers"].items()}
+        self.objects = data["objects"]
+        self.tiles = data["tiles"]
+        self.images = {}
+
+    def layer_tiles(self, name):
+        """Yield (x, y, surface) for each tile of a tile layer, row by row."""
+        gids = self.layers[name]
+        for index, gid in enumerate(gids):
+            if gid:
+                y, x = divmod(index, self.width)
+                yield x, y, self.image(gid)
+
+    def layer_objects(self, name):
+        """Return the objects of an object layer."""
+        return [
+            MapObject(obj_name, x, y, width, height, self.image(gid) if gid else None)
+            for obj_name, x, y, width, height, gid in self.objects[name]
+        ]
+
+    def image(self, gid):
+        """Return the surface for a tile id, cutting it out on first use."""
+        if gid not in self.images:
+            source, rect, flags, colorkey = self.tiles[gid]
+            image = assets.image(self.directory / source)
+            tile = image.subsurface(rect) if rect else image.copy()
+
+            flipped_horizontally, flipped_vertically, flipped_diagonally = flags
+            if flipped_diagonally:
+                tile = pygame.transform.flip(pygame.transform.rotate(tile, 270), 1, 0)
+            if flipped_horizontally or flipped_vertically:
+                tile = pygame.transform.flip(
+                    tile, flipped_horizontally, flipped_vertically
+                )
+            if colorkey:
+                tile = tile.convert()
+                tile.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.images[gid] = tile
+        return self.images[gid]
+
+
+def load_map(path, cache_path=None):
+    """
+    Load a Tiled map, parsing the TMX only when no usable cache exists.
+
+    With a cache_path, the compiled map is stored there together with the
+    modification times of the TMX and TSX files and reused until one of
+    them changes.
+    """
+    path = Path(path)
+    if cache_path:
+        data = read_map_cache(cache_path)
+        if data and _sources_unchanged(data["sources"]):
+            return TileMap(path, data)
+
+    data = compile_map(path)
+    if cache_path:
+        write_map_cache(cache_path, data)
+    return TileMap(path, data)
+
+
+def compile_map(path):
+    """Parse a TMX file with pytmx and reduce it to plain data."""
+    tmx_data = load_pygame(path)
+
+    layers = {}
+    objects = {}
+    for layer in tmx_data.layers:
+        if hasattr(layer, "data"):
+            gids = array("I", (gid for row in layer.data for gid in row))
+            layers[layer.name] = gids.tobytes()
+        else:
+            objects[layer.name] = [
+                (obj.name, obj.x, obj.y, obj.width, obj.height, obj.gid)
+                for obj in layer
+            ]
+
+    used_gids = {gid for gids in layers.values() for gid in array("I", gids)}
+    used_gids |= {obj[5] for layer in objects.values() for obj in layer}
+    used_gids.discard(0)
+
+    tiles = {gid: _tile_reference(tmx_data, gid) for gid in used_gids}
+
+    sources = [path.resolve()] + [
+        (path.parent / tileset.get("source")).resolve()
+        for tileset in ElementTree.parse(path).getroot().iter("tileset")
+        if tileset.get("source")
+    ]
+    return {
+        "version": MAP_CACHE_VERSION,
+        "sources": {str(source): source.stat().st_mtime_ns for source in sources},
+        "width": tmx_data.width,
+        "height": tmx_data.height,
+        "tile_width": tmx_data.tilewidth,
+        "tile_height": tmx_data.tileheight,
+        "layers": layers,
+        "objects": objects,
+        "tiles": tiles,
+    }
+
+
+def _tile_reference(tmx_data, gid):
+    """Return (source, rect, flags, colorkey) describing a tile id's image."""
+    tiled_gid = tmx_data.tiledgidmap[gid]
+    flags = next(flags for mapped, flags in tmx_data.gidmap[tiled_gid] if mapped == gid)
+    flags = (
+        bool(flags.flipped_horizontally),
+        bool(flags.flipped_vertically),
+        bool(flags.flipped_diagonally),
+    )
+
+    # Tiles of collection tilesets carry their own image
+    props = tmx_data.tile_properties.get(gid, {})
+    if props.get("source"):
+        return props["source"], None, flags, _colorkey(props.get("trans"))
+
+    tileset = max(
+        (ts for ts in tmx_data.tilesets if ts.firstgid <= tiled_gid),
+        key=lambda ts: ts.firstgid,
+    )
+    # Same walk over the tileset image as pytmx uses
+    positions = product(
+        range(
+            tileset.margin,
+            tileset.height + tileset.margin - tileset.tileheight + 1,
+            tileset.tileheight + tileset.spacing,
+        ),
+        range(
+            tileset.margin,
+            tileset.width + tileset.margin - tileset.tilewidth + 1,
+            tileset.tilewidth + tileset.spacing,
+        ),
+    )
+    for real_gid, (y, x) in enumerate(positions, tileset.firstgid):
+        if real_gid == tiled_gid:
+            rect = (x, y, tileset.tilewidth, tileset.tileheight)
+            colorkey = _colorkey(getattr(tileset, "trans", None))
+            return tileset.source, rect, flags, colorkey
+    raise ValueError(f"Tile {tiled_gid} is outside of tileset {tileset.name}")
+
+
+def _colorkey(trans):
+    """Normalize a Tiled transparent color to a pygame color string."""
+    if trans and not trans.startswith("#"):
+        return f"#{trans}"
+    return trans
+
+
+def read_map_cache(cache_path):
+    """Return the compiled map stored at cache_path, or None if unusable."""
+    try:
+        with open(cache_path, "rb") as file:
+            data = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MAP_CACHE_VERSION:
+        return None
+    return data
+
+
+def write_map_cache(cache_path, data):
+    """Store a compiled map at cache_path, ignoring unwritable locations."""
+    try:
+        with open(cache_path, "wb") as file:
+            marshal.dump(data, file)
+    except OSError:
+        pass
+
+
+def _sources_unchanged(sources):
+    """Return whether every source file still has its recorded mtime."""
+    try:
+        return all(
+            Path(source).stat().st_mtime_ns == mtime
+            for source, mtime in sources.items()
+        )
+    except OSError:
+        return False
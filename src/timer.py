@@ -1,33 +1,92 @@
-import pygame
+from heapq import heappop, heappush
+from itertools import count
+
+
+class ScheduledCall:
+    """Handle of a callback waiting in a Scheduler."""
+
+    __slots__ = ("callback", "is_cancelled")
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.is_cancelled = False
+
+    def cancel(self):
+        """Prevent the callback from running."""
+        self.is_cancelled = True
+        self.callback = None
+
+
+class Scheduler:
+    """
+    Runs callbacks at deadlines kept in a min-heap.
+
+    Time is in milliseconds and only moves when advance() is called, so the
+    owner decides whether it runs in real time, pauses, fast-forwards or
+    steps. Cancelled calls stay in the heap and are skipped once they come
+    up, so the cost of advancing depends only on the calls that are due.
+    """
+
+    def __init__(self, time=0):
+        self.time = time
+        self.heap = []
+        self.counter = count()
+
+    def call_at(self, time, callback):
+        """Schedule callback to run once the clock reaches time."""
+        call = ScheduledCall(callback)
+        heappush(self.heap, (time, next(self.counter), call))
+        return call
+
+    def call_later(self, delay, callback):
+        """Schedule callback to run delay milliseconds from now."""
+        return self.call_at(self.time + delay, callback)
+
+    def advance(self, milliseconds):
+        """Move the clock forward and run every call that became due."""
+        self.time += milliseconds
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            _, _, call = heappop(heap)
+            if not call.is_cancelled:
+                callback = call.callback
+                call.cancel()
+                callback()
+
+    def __len__(self):
+        return len(self.heap)
 
 
 class Timer:
     """A simple timer class to manage countdowns and callbacks."""
 
-    def __init__(self, duration, callback=None):
+    def __init__(self, duration, scheduler, callback=None):
         self.duration = duration
+        self.scheduler = scheduler
         self.callback = callback
         self.start_time = 0
         self.is_active = False
+        self.scheduled_call = None
 
     def start(self):
-        """Activates the timer and records the start time."""
+        """Activates the timer and schedules its expiry."""
+        if self.scheduled_call:
+            self.scheduled_call.cancel()
         self.is_active = True
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.scheduler.time
+        self.scheduled_call = self.scheduler.call_later(self.duration, self._expire)
 
     def stop(self):
-        """Deactivates the timer and resets the start time."""
+        """Deactivates the timer and cancels its pending expiry."""
+        if self.scheduled_call:
+            self.scheduled_call.cancel()
+            self.scheduled_call = None
         self.is_active = False
         self.start_time = 0
 
-    def update(self):
-        """
-        Updates the timer state,
-        checking for expiration and triggering the callback.
-        """
-        if self.is_active:
-            elapsed_time = pygame.time.get_ticks() - self.start_time
-            if elapsed_time >= self.duration:
-                if self.callback:
-                    self.callback()
-                self.stop()
+    def _expire(self):
+        """Trigger the callback once the duration has elapsed."""
+        self.scheduled_call = None
+        if self.callback:
+            self.callback()
+        self.stop()
@@ -1,32 +1,25 @@
-import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
-
-
 class ScreenTransition:
     """Handles the screen transition effect during state changes."""
 
     def __init__(self, reset_level_callback, player):
-        self.display_surface = pygame.display.get_surface()
         self.reset_level_callback = reset_level_callback
         self.player = player
 
-        self.transition_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.color_intensity = 255
-        self.transition_speed = -2
+        self.fade_speed = 120  # Color intensity per second
+        self.transition_speed = -self.fade_speed
 
-    def play_transition(self):
-        """Play the transition effect."""
-        self.update_color_intensity()
-        self.fill_transition_surface()
+    def update(self, delta_time):
+        """Advance the transition effect by delta_time seconds."""
+        self.update_color_intensity(delta_time)
 
-        # Draw the transition effect
-        self.display_surface.blit(
-            self.transition_surface, (0, 0), special_flags=pygame.BLEND_RGB_MULT
-        )
+    def tint(self):
+        """Return the color the screen is multiplied by."""
+        return (self.color_intensity,) * 3
 
-    def update_color_intensity(self):
+    def update_color_intensity(self, delta_time):
         """Update the color intensity for the transition effect."""
-        self.color_intensity += self.transition_speed
+        self.color_intensity += self.transition_speed * delta_time
 
         if self.color_intensity <= 0:
             self.reverse_transition()
@@ -43,10 +36,5 @@ class ScreenTransition:
         """Finalize the transition effect and set the player state."""
         self.color_intensity = 255
         self.player.is_sleeping = False
-        self.transition_speed = -2  # Reset speed for future transitions
-
-    def fill_transition_surface(self):
-        """Fill the transition surface with the current color intensity."""
-        self.transition_surface.fill(
-            (self.color_intensity, self.color_intensity, self.color_intensity)
-        )
+        # Reset speed for future transitions
+        self.transition_speed = -self.fade_speed
@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def display(monkeypatch):
+    """Open a headless display from the repo root, where assets are found."""
+    import pygame
+    from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    monkeypatch.chdir(ROOT)
+    pygame.init()
+    yield pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.quit()
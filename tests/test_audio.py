@@ -0,0 +1,22 @@
+import pygame
+import pytest
+
+from audio import AudioManager
+from settings import AUDIO_CHANNELS, SOUND_EFFECTS
+
+
+def test_playing_after_loading_again(display):
+    audio = AudioManager(SOUND_EFFECTS, AUDIO_CHANNELS)
+    audio.load()
+    audio.play("water")
+    audio.load(in_background=True)
+    audio.play("water")
+
+    assert len(audio.voices["water"]) == 1
+
+
+def test_background_decoding_error_is_raised(display):
+    audio = AudioManager({"missing": ("missing.wav", "tools", 1.0, 1)}, {"tools": 1})
+    audio.load(in_background=True)
+    with pytest.raises((FileNotFoundError, pygame.error)):
+        audio.play("missing")
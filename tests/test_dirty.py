@@ -0,0 +1,57 @@
+import random
+
+import pygame
+
+from dirty import DirtyRects, present
+
+
+def full_redraw(level):
+    """Draw the level with dirty rects off and return the screen pixels."""
+    dirty_rects, level.dirty_rects = level.dirty_rects, None
+    level.draw()
+    level.dirty_rects = dirty_rects
+    return pygame.image.tobytes(pygame.display.get_surface(), "RGB")
+
+
+def test_closing_the_shop_redraws_the_whole_screen(display):
+    from level import Level
+
+    random.seed(0)
+    level = Level(save_path=None)
+    level.dirty_rects = DirtyRects()
+    level.draw()
+    level.draw()
+
+    level.toggle_shop()
+    assert level.draw() is None
+
+    level.toggle_shop()
+    assert level.draw() is None
+    closed_frame = pygame.image.tobytes(display, "RGB")
+    assert closed_frame == full_redraw(level)
+
+
+def test_forced_full_frame_is_not_diffed_against():
+    dirty_rects = DirtyRects()
+    surf = pygame.Surface((10, 10))
+    frame = [(surf, (0, 0))]
+
+    assert dirty_rects.changed_rects(frame, "state") is None
+    assert dirty_rects.changed_rects(frame, "state") == []
+    assert dirty_rects.changed_rects(frame, "state", force_full=True) is None
+    assert dirty_rects.changed_rects(frame, "state") is None
+    assert dirty_rects.changed_rects(frame, "state") == []
+
+
+def test_full_redraw_updates_the_whole_window(display, monkeypatch):
+    from level import Level
+
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", lambda *args: updates.append(args))
+    random.seed(0)
+    level = Level(save_path=None)
+    level.dirty_rects = DirtyRects()
+
+    present(level.draw())
+    present(level.draw())
+    assert updates == [(), ([],)]